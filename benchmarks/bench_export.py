@@ -0,0 +1,42 @@
+"""Benchmark - bulk raw data table export vs. one df3.to_csv per well (v2.5).
+
+Run from the top folder:
+   python benchmarks/bench_export.py [rows] [wells]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from hydrographer import derive, export_csv, export_parquet, prepare, raw_data_table  # noqa: E402
+from hydrographer.export import CSV_NAME                                               # noqa: E402
+from hydrographer.synthetic import synthetic_gwsi                                      # noqa: E402
+
+
+def per_well_csv(ready, outdir):
+    os.makedirs(outdir)
+    t0 = time.perf_counter()
+    table = raw_data_table(ready)
+    for i, location in enumerate(ready.ids.tolist()):
+        df3 = table.iloc[ready.starts[i]:ready.ends[i]]
+        df3.to_csv(os.path.join(outdir, CSV_NAME.format(tag="Manual", well=location)), index=False)
+    return len(ready) / (time.perf_counter() - t0)
+
+
+def main(rows=1_000_000, n_wells=10_000):
+    df, df2 = synthetic_gwsi(n_wells, rows=rows)
+    ready, bad_wells = derive(prepare(df, df2))
+    print("rows: %d   wells: %d" % (len(ready.table), len(ready)))
+    with tempfile.TemporaryDirectory() as outdir:
+        print("per-well to_csv  %8.0f wells/s" % per_well_csv(ready, os.path.join(outdir, "a")))
+        print("export_csv       %8.0f wells/s" % export_csv(ready, os.path.join(outdir, "b"))["wells_per_second"])
+        try:
+            stats = export_parquet(ready, os.path.join(outdir, "c"))
+            print("export_parquet   %8.0f wells/s" % stats["wells_per_second"])
+        except ImportError:
+            print("export_parquet   skipped (pyarrow not installed)")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,83 @@
+"""Benchmark - reused HydrographFigure vs. a new pyplot figure per well.
+
+Draws the same synthetic wells two ways and reports the time per figure and
+the Python heap still held after every 50 wells (tracemalloc):
+
+   new figure  - plt.figure() + twinx() per well and no plt.close(), as in
+                 the v2.x loop.
+   reused      - one HydrographFigure (headless Agg canvas, no pyplot), only
+                 data/limits/title updated.
+
+Run from the top folder:
+   python benchmarks/bench_figure_reuse.py [wells] [dpi]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt                                   # noqa: E402
+import numpy as np                                                # noqa: E402
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from hydrographer import COL, derive, prepare                     # noqa: E402
+from hydrographer.figure import HydrographFigure                  # noqa: E402
+from hydrographer.metadata import axis_limits, title              # noqa: E402
+from hydrographer.synthetic import synthetic_gwsi                 # noqa: E402
+
+
+def synthetic_wells(n_wells, seed=0):
+    df, df2 = synthetic_gwsi(n_wells, seed=seed)
+    ready, _ = derive(prepare(df, df2))
+    table = ready.table
+    for location, start, end in zip(ready.ids.tolist(), ready.starts, ready.ends):
+        arrays = {name: table[name].to_numpy()[start:end] for name in ("Date", "DEPTH_TO_WATER", "WLE_Calc")}
+        arrays.update({COL: location, "SITE_WELL_REG_ID": table["SITE_WELL_REG_ID"].iat[start],
+                       "SITE_WELL_DEPTH": table["SITE_WELL_DEPTH"].iat[start]})
+        yield arrays
+
+
+def new_figure(arrays, filename, dpi):
+    x = arrays["Date"]
+    plt.rcParams["xtick.labelsize"] = 8
+    fig = plt.figure()
+    ax1 = fig.add_subplot(111)
+    ax1.plot(x, arrays["DEPTH_TO_WATER"])
+    ax1.invert_yaxis()
+    ax2 = ax1.twinx()
+    ax2.plot(x, arrays["WLE_Calc"], "b-")
+    ax2.plot(x, arrays["WLE_Calc"], "bP")
+    fig.suptitle(title(arrays), fontsize=12)
+    xmin, xmax, x_ticks = axis_limits(x)
+    ax1.set_xlim([xmin, xmax])
+    ax1.xaxis.set_major_locator(matplotlib.dates.YearLocator(x_ticks))
+    fig.savefig(filename, dpi=dpi, bbox_inches="tight", pad_inches=.1)
+
+
+def run(label, draw, wells, outdir):
+    tracemalloc.start()
+    times = []
+    for i, arrays in enumerate(wells):
+        t0 = time.perf_counter()
+        draw(arrays, os.path.join(outdir, "%s.png" % arrays[COL]))
+        times.append(time.perf_counter() - t0)
+        if (i + 1) % 50 == 0:
+            print("  %-10s %5d wells  heap %7.1f MB" % (label, i + 1, tracemalloc.get_traced_memory()[0] / 1e6))
+    tracemalloc.stop()
+    print("%-10s %.1f ms/figure (median %.1f)" % (label, np.mean(times) * 1e3, np.median(times) * 1e3))
+
+
+def main(n_wells=200, dpi=100):
+    with tempfile.TemporaryDirectory() as outdir:
+        run("new figure", lambda a, f: new_figure(a, f, dpi), synthetic_wells(n_wells), outdir)
+        plt.close("all")
+        figure = HydrographFigure(dpi)
+        run("reused", figure.render, synthetic_wells(n_wells), outdir)
+        figure.close()
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,31 @@
+"""Benchmark - time per well and file size of each output profile.
+
+Draws the same synthetic wells with every profile in
+``hydrographer.profiles.PROFILES`` (quicklook, publication, svg, pdf).
+
+Run from the top folder:
+   python benchmarks/bench_profiles.py [wells]
+"""
+import os
+import sys
+import tempfile
+
+import matplotlib
+matplotlib.use("Agg")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from hydrographer import derive, prepare                          # noqa: E402
+from hydrographer.profiles import compare_profiles                # noqa: E402
+from hydrographer.synthetic import synthetic_gwsi                 # noqa: E402
+
+
+def main(n_wells=20):
+    df, df2 = synthetic_gwsi(n_wells)
+    ready, _ = derive(prepare(df, df2))
+    with tempfile.TemporaryDirectory() as outdir:
+        table = compare_profiles(ready, outdir, sample=n_wells)
+    print(table.to_string(index=False, float_format="%.3f"))
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
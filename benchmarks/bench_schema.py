@@ -0,0 +1,39 @@
+"""Benchmark - memory of the levels table before and after the compact schema.
+
+Writes a synthetic GWSI_WW_LEVELS table to a .txt file, reads it the v2.x way
+(``pd.read_csv`` with default types) and with ``hydrographer.read_levels``,
+and prints the memory per column and the time of both reads.
+
+Run from the top folder:
+   python benchmarks/bench_schema.py [wells]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from hydrographer import COL_NAMES, read_levels                   # noqa: E402
+from hydrographer.schema import memory_report                     # noqa: E402
+from hydrographer.synthetic import synthetic_gwsi                 # noqa: E402
+
+
+def main(n_wells=40_000):
+    df, _ = synthetic_gwsi(n_wells)
+    with tempfile.TemporaryDirectory() as workdir:
+        txt = os.path.join(workdir, "GWSI_WW_LEVELS.txt")
+        df.to_csv(txt, index=False)
+        t0 = time.perf_counter()
+        before = pd.read_csv(txt, names=COL_NAMES, header=0, parse_dates=["Date"])
+        t1 = time.perf_counter()
+        after = read_levels(txt)
+        t2 = time.perf_counter()
+    print("rows: %d   wells: %d" % (len(after), n_wells))
+    print(memory_report(before, after).to_string(float_format="%.2f"))
+    print("read_csv %.2f s   read_levels %.2f s" % (t1 - t0, t2 - t1))
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
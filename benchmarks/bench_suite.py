@@ -0,0 +1,207 @@
+"""Benchmark suite - every pipeline stage on synthetic GWSI data at several scales.
+
+For each scale in ``hydrographer.synthetic.SCALES`` (or the ones named on
+the command line) the suite generates GWSI_WW_LEVELS / GWSI_SITES tables,
+writes the levels table to a .txt file like the Data_Tables in the ADWR zip,
+and times:
+
+   load     read_csv of the .txt (v2.x), load_levels cold (fills the cache)
+            and warm (Feather cache reload)
+   join     v2.6 - pd.merge of the whole tables + boolean scan for every well
+            (a sample of wells, extrapolated) vs. prepare
+   clean    v2.6 per-well WLE_Calc / Rise / fillna / drop (sample,
+            extrapolated) vs. derive and validate
+   metadata well_metadata
+   render   HydrographFigure on a sample of wells, extrapolated to all
+   export   export_csv and export_parquet
+
+Legacy timings from a sample are marked "extrapolated"; the aim is to catch
+regressions between versions, not to report exact statewide run times.
+With ``--baseline`` the results are compared with an earlier ``--out`` CSV:
+every stage/engine of this package that takes more than ``--tolerance``
+times its baseline (and at least MIN_SLOWDOWN seconds more) is listed and
+the suite exits with status 1.  The v2.x reference engines are not compared.
+
+Run from the top folder:
+   python benchmarks/bench_suite.py [--scales small medium] [--out results.csv]
+   python benchmarks/bench_suite.py --baseline results.csv [--tolerance 1.25]
+"""
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from hydrographer import (COL, COL_NAMES, LEGACY_RULES, derive, export_csv, export_parquet,  # noqa: E402
+                          load_levels, prepare, validate, well_metadata)
+from hydrographer.render import iter_payloads                                             # noqa: E402
+from hydrographer.synthetic import SCALES, synthetic_gwsi                                  # noqa: E402
+
+FIELDS = ["scale", "wells", "rows", "stage", "engine", "seconds", "extrapolated", "wells_per_second"]
+##THE v2.x CODE THE PACKAGE IS MEASURED AGAINST, NOT PART OF IT
+REFERENCE_ENGINES = ("read_csv", "v2.6 per-well merge", "v2.6 per-well")
+TOLERANCE = 1.25
+##TIMES THIS CLOSE ARE NOISE, WHATEVER THE RATIO
+MIN_SLOWDOWN = 0.01
+
+
+class Results:
+    def __init__(self, scale, n_wells, n_rows):
+        self.rows = []
+        self.scale, self.n_wells, self.n_rows = scale, n_wells, n_rows
+
+    def add(self, stage, engine, seconds, extrapolated=False):
+        row = {"scale": self.scale, "wells": self.n_wells, "rows": self.n_rows, "stage": stage,
+               "engine": engine, "seconds": seconds, "extrapolated": extrapolated,
+               "wells_per_second": self.n_wells / seconds if seconds else float("inf")}
+        self.rows.append(row)
+        print("  %-9s %-20s %10.3f s%s" % (stage, engine, seconds, "  (extrapolated)" if extrapolated else ""))
+
+
+def timed(function, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - t0
+
+
+def legacy_join(df, df2, wells):
+    for location in wells:
+        df3 = pd.merge(df, df2, on=COL)
+        df3.loc[df3[COL] == location].sort_values("Date")
+
+
+def legacy_clean(prepared, wells):
+    for location in wells:
+        df4 = prepared.well(location).copy()
+        df4["WLE_Calc"] = df4["SITE_WELL_ALTITUDE"] - df4["DEPTH_TO_WATER"]
+        df4["Rise"] = df4["WATER_LEVEL_ELEVATION"] - df4["WATER_LEVEL_ELEVATION"].min()
+        df4.fillna(value=0, inplace=True)
+        df4.drop(df4[df4["DEPTH_TO_WATER"] == 0].index, inplace=True)
+
+
+def run_scale(scale, n_wells, workdir, seed=0, legacy_sample=20, render_sample=10, dpi=100):
+    df, df2 = synthetic_gwsi(n_wells, seed=seed)
+    results = Results(scale, n_wells, len(df))
+    print("%s: %d wells, %d rows" % (scale, n_wells, len(df)))
+
+    ##LOAD
+    txt = os.path.join(workdir, "GWSI_WW_LEVELS_%s.txt" % scale)
+    df.to_csv(txt, index=False)
+    _, seconds = timed(pd.read_csv, txt, names=COL_NAMES, header=0, parse_dates=["Date"])
+    results.add("load", "read_csv", seconds)
+    cache_dir = os.path.join(workdir, "cache")
+    _, seconds = timed(load_levels, txt, cache_dir=cache_dir)
+    results.add("load", "load_levels cold", seconds)
+    _, seconds = timed(load_levels, txt, cache_dir=cache_dir)
+    results.add("load", "load_levels warm", seconds)
+
+    ##JOIN
+    df2_keyed = df2.rename(columns={"SITE_WELL_SITE_ID": COL})
+    wells = df[COL].unique()
+    sample = wells[:legacy_sample]
+    _, seconds = timed(legacy_join, df, df2_keyed, sample)
+    results.add("join", "v2.6 per-well merge", seconds / len(sample) * len(wells), extrapolated=True)
+    prepared, seconds = timed(prepare, df, df2)
+    results.add("join", "prepare", seconds)
+
+    ##CLEAN
+    _, seconds = timed(legacy_clean, prepared, prepared.ids[:legacy_sample])
+    results.add("clean", "v2.6 per-well", seconds / min(legacy_sample, len(prepared)) * len(prepared),
+                extrapolated=True)
+    ##SAME fillna(0) AND ZERO-DEPTH DROP AS THE v2.6 LOOP; validate BELOW TIMES THE DEFAULT RULES
+    (ready, _), seconds = timed(derive, prepared, LEGACY_RULES)
+    results.add("clean", "derive", seconds)
+    _, seconds = timed(validate, prepared)
+    results.add("clean", "validate", seconds)
+
+    meta, seconds = timed(well_metadata, ready)
+    results.add("metadata", "well_metadata", seconds)
+
+    ##RENDER, A SAMPLE OF WELLS ON ONE REUSED FIGURE
+    import matplotlib
+    matplotlib.use("Agg")
+    from hydrographer.figure import HydrographFigure
+
+    figure = HydrographFigure(dpi)
+    outdir = os.path.join(workdir, "png_%s" % scale)
+    os.makedirs(outdir, exist_ok=True)
+    t0 = time.perf_counter()
+    for i, arrays in enumerate(iter_payloads(ready, meta=meta)):
+        if i == render_sample:
+            break
+        figure.render(arrays, os.path.join(outdir, "%s.png" % arrays[COL]))
+    seconds = time.perf_counter() - t0
+    figure.close()
+    results.add("render", "figure dpi=%d" % dpi, seconds / min(render_sample, len(ready)) * len(ready),
+                extrapolated=True)
+
+    ##EXPORT
+    stats, _ = timed(export_csv, ready, os.path.join(workdir, "csv_%s" % scale))
+    results.add("export", "export_csv", stats["seconds"])
+    try:
+        stats = export_parquet(ready, os.path.join(workdir, "parquet_%s" % scale))
+        results.add("export", "export_parquet", stats["seconds"])
+    except ImportError:
+        print("  export    export_parquet skipped (pyarrow not installed)")
+    return results.rows
+
+
+def read_results(path):
+    """Return ``{(scale, stage, engine): seconds}`` from a CSV written with ``--out``."""
+    with open(path, newline="") as fh:
+        return {(row["scale"], row["stage"], row["engine"]): float(row["seconds"]) for row in csv.DictReader(fh)}
+
+
+def regressions(rows, baseline, tolerance=TOLERANCE):
+    """Return ``[(scale, stage, engine, old, new), ...]`` for the engines slower than ``tolerance`` x baseline."""
+    slower = []
+    for row in rows:
+        key = (row["scale"], row["stage"], row["engine"])
+        if row["engine"] in REFERENCE_ENGINES or key not in baseline:
+            continue
+        old, new = baseline[key], row["seconds"]
+        if new > old * tolerance and new - old > MIN_SLOWDOWN:
+            slower.append(key + (old, new))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="time every stage on synthetic GWSI data")
+    parser.add_argument("--scales", nargs="+", default=["small"], choices=sorted(SCALES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--legacy-sample", type=int, default=20, help="wells timed for the v2.6 loops")
+    parser.add_argument("--render-sample", type=int, default=10, help="wells drawn for the render stage")
+    parser.add_argument("--dpi", type=int, default=100)
+    parser.add_argument("--out", help="write the results to this CSV")
+    parser.add_argument("--baseline", metavar="CSV", help="compare with the results of an earlier --out")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="slowdown ratio over the baseline that counts as a regression (default %(default)s)")
+    args = parser.parse_args(argv)
+    baseline = read_results(args.baseline) if args.baseline else None
+
+    rows = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for scale in args.scales:
+            rows.extend(run_scale(scale, SCALES[scale], workdir, args.seed, args.legacy_sample,
+                                  args.render_sample, args.dpi))
+    if args.out:
+        with open(args.out, "w", newline="") as fh:
+            writer = csv.DictWriter(fh, FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+    if baseline is not None:
+        slower = regressions(rows, baseline, args.tolerance)
+        print("%d of the baseline timings are more than %gx slower" % (len(slower), args.tolerance))
+        for scale, stage, engine, old, new in slower:
+            print("  %-7s %-9s %-20s %10.3f s -> %.3f s (%.2fx)" % (scale, stage, engine, old, new, new / old))
+        if slower:
+            sys.exit(1)
+    return rows
+
+
+if __name__ == "__main__":
+    main()
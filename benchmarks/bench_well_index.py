@@ -0,0 +1,70 @@
+"""Benchmark - WellIndex lookups vs. the v2.2 - v2.5 boolean-scan loop.
+
+Builds synthetic GWSI_WW_LEVELS (about 5,000,000 rows by default) and
+GWSI_SITES tables with ``hydrographer.synthetic``, then times:
+
+   legacy  - df.loc[df[col] == location] plus four df2[df2[col] == location]
+             lookups per well, as in versions 2.2, 2.3 and 2.5.  This is far
+             too slow to run for every well, so a sample of wells is timed and
+             the total is extrapolated.
+   index   - building a WellIndex once, then slicing every well's arrays and
+             reading its site attributes.
+
+Run from the top folder:
+   python benchmarks/bench_well_index.py [rows] [wells] [legacy_sample]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from hydrographer import COL                                # noqa: E402
+from hydrographer.index import WellIndex                   # noqa: E402
+from hydrographer.synthetic import synthetic_gwsi          # noqa: E402
+
+
+def legacy_loop(df, df2, wells):
+    col = COL
+    df2 = df2.rename(columns={"SITE_WELL_SITE_ID": col})
+    df2["WELL_BOT"] = df2["SITE_WELL_ALTITUDE"] - df2["SITE_WELL_DEPTH"]
+    for location in wells:
+        df3 = df.loc[df[col] == location].copy()
+        df3 = df3.sort_values("Date")
+        df3["LSE"] = df2[df2[col] == location]["SITE_WELL_ALTITUDE"].iloc[0]
+        df3["Bottom"] = df2[df2[col] == location]["WELL_BOT"].iloc[0]
+        df3["Depth"] = df2[df2[col] == location]["SITE_WELL_DEPTH"].iloc[0]
+        df3["Reg_No"] = df2[df2[col] == location]["SITE_WELL_REG_ID"].iloc[0]
+
+
+def index_loop(index):
+    for location in index:
+        obs = index.observations(location, ["Date", "DEPTH_TO_WATER"])
+        site = index.site(location)
+        obs["DEPTH_TO_WATER"].min(), site["SITE_WELL_ALTITUDE"]
+
+
+def main(rows=5_000_000, n_wells=40_000, sample=50):
+    ##EVERY WELL HAS A SITE RECORD, THE LEGACY LOOKUPS ASSUME ONE
+    df, df2 = synthetic_gwsi(n_wells, rows=rows, missing_sites=0)
+    wells = df[COL].unique()
+    print("rows: %d   wells: %d" % (len(df), len(wells)))
+
+    t0 = time.perf_counter()
+    legacy_loop(df, df2, wells[:sample])
+    legacy_per_well = (time.perf_counter() - t0) / sample
+    print("legacy   %8.2f ms/well   ~%9.1f s for all wells (from %d sampled)"
+          % (legacy_per_well * 1e3, legacy_per_well * len(wells), sample))
+
+    t0 = time.perf_counter()
+    index = WellIndex(df, df2)
+    build = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    index_loop(index)
+    loop = time.perf_counter() - t0
+    print("index    build %.2f s + %.2f s for all wells (%.1f us/well)"
+          % (build, loop, loop / len(wells) * 1e6))
+    print("speedup  ~%.0fx" % (legacy_per_well * len(wells) / (build + loop)))
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
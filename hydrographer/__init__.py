@@ -0,0 +1,28 @@
+"""Hydro-Grapher engine - reusable stages for the GWSI Manual Water Levels Grapher.
+
+The versioned Hydro-Grapher scripts in the top folder are run as top-level
+code.  This package holds the pieces they share, so the statewide run does
+each expensive step (reading, joining, sorting) once instead of per well.
+"""
+from .prepare import COL, COL_NAMES, COL_START, PreparedWells, prepare, read_well_list, well_offsets
+from .index import SITE_COLUMNS, WellIndex
+from .readers import SITE_READ_COLUMNS, load_levels, load_sites, read_levels, read_sites
+from .gwsi_zip import read_zip_levels, read_zip_sites, read_zip_transducer
+from .render import render_wells
+from .manifest import Manifest, snapshot_fingerprints, well_fingerprints
+from .diff import SnapshotDiff, diff_fingerprints, render_changed
+from .derive import clean, derive
+from .metadata import well_metadata
+from .quality import LEGACY_RULES, RULES, Rule, code_filter, validate
+from .export import export_csv, export_parquet, raw_data_table
+from .pest import observation_table, write_observation_files
+from .spatial import WellLocator, coordinates_from_site_id, read_polygon
+from .timing import RunTimer
+from .synthetic import synthetic_gwsi
+from .profiles import PROFILES, OutputProfile, compare_profiles
+from .batch import write_contact_sheets, write_pdfs
+from .schema import LEVELS_SCHEMA, SITES_SCHEMA, apply_schema, memory_report
+from .encode import PngWriter
+from .stats import STATS_COLUMNS, well_stats, write_stats
+from .periods import aggregate, annual_periods, period_table, read_stress_periods, seasonal_periods
+from .transducer import downsample, prepare_transducer
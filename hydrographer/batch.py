@@ -0,0 +1,189 @@
+"""Batch output: multi-page PDFs and thumbnail contact sheets.
+
+One PNG per well means tens of thousands of files in one folder, which is
+slow to write to the network shares and slow to page through.  The batch
+modes put many wells in one file:
+
+   write_pdfs            one page per well, one PDF per group (AMA, basin,
+                         any per-well label) or per ``wells_per_file`` wells
+   write_contact_sheets  a grid of ``rows`` x ``cols`` thumbnails per page,
+                         saved as numbered PNGs or as pages of one PDF
+
+Both draw on a single reused figure (a ``HydrographFigure`` for the PDF
+pages, one grid of thumbnail axes for the sheets) and hand every page to
+the file as soon as it is drawn, so memory does not grow with the number of
+wells.  Both return ``[(filename, wells, seconds), ...]``.
+"""
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from .derive import derive, is_derived
+from .metadata import well_metadata
+from .prepare import COL
+from .render import OUT_PREFIX, iter_payloads
+
+WELLS_PER_FILE = 500
+SHEET_ROWS = 5
+SHEET_COLS = 4
+SHEET_DPI = 150
+NO_GROUP = "other"
+
+
+def _ready(prepared):
+    if is_derived(prepared):
+        return prepared
+    return derive(prepared)[0]
+
+
+def _safe(label):
+    return "".join(c if c.isalnum() or c in "-_" else "_" for c in str(label))
+
+
+def file_groups(ready, groups=None, wells_per_file=WELLS_PER_FILE):
+    """Return ``[(name, positions), ...]``: which wells (row numbers of ``ready.ids``) go in which file.
+
+    ``groups`` is a per-well label - a Series indexed by WELL_SITE_ID, or
+    the name of a column of ``ready.table`` (such as an AMA or basin field
+    kept from GWSI_SITES).  Wells without a label go to "other".  Every
+    group is split further so no file has more than ``wells_per_file`` wells.
+    """
+    if groups is None:
+        labels = np.full(len(ready), "", dtype=object)
+    else:
+        if isinstance(groups, str):
+            groups = pd.Series(ready.table[groups].to_numpy()[ready.starts], index=ready.ids)
+        labels = pd.Series(ready.ids).map(groups).fillna(NO_GROUP).astype(str).to_numpy()
+
+    files = []
+    for label in sorted(set(labels.tolist())):
+        positions = np.flatnonzero(labels == label)
+        parts = max(1, -(-len(positions) // wells_per_file))
+        for part in range(parts):
+            ##NUMBER THE FILES WHEN A GROUP IS SPLIT, OR WHEN THERE ARE NO GROUPS AT ALL
+            name = _safe(label)
+            if parts > 1 or not label:
+                name = "%s_%04d" % (name, part + 1) if name else "%04d" % (part + 1)
+            files.append((name, positions[part * wells_per_file:(part + 1) * wells_per_file]))
+    return files
+
+
+def write_pdfs(prepared, outdir=".", groups=None, wells_per_file=WELLS_PER_FILE, dpi=None):
+    """Write one multi-page PDF (a page per well) for every group of wells; see ``file_groups``."""
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    from .figure import HydrographFigure
+
+    ready = _ready(prepared)
+    meta = well_metadata(ready)
+    os.makedirs(outdir, exist_ok=True)
+    ##FIXED LAYOUT, SO EVERY PAGE HAS THE SAME SIZE AND NO TIGHT-BBOX PASS IS NEEDED
+    figure = HydrographFigure(dpi or 100, tight=False)
+    done = []
+    try:
+        for name, positions in file_groups(ready, groups, wells_per_file):
+            filename = os.path.join(outdir, "%s%s.pdf" % (OUT_PREFIX, name))
+            t0 = time.perf_counter()
+            with PdfPages(filename) as pdf:
+                for arrays in iter_payloads(ready, meta=meta, positions=positions):
+                    figure.update(arrays)
+                    pdf.savefig(figure.fig)
+            done.append((filename, len(positions), time.perf_counter() - t0))
+    finally:
+        figure.close()
+    return done
+
+
+class ContactSheet:
+    """A reusable grid of hydrograph thumbnails (water level elevation over time)."""
+
+    def __init__(self, rows=SHEET_ROWS, cols=SHEET_COLS, dpi=SHEET_DPI):
+        from matplotlib import dates
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        self.dpi = dpi
+        ##HEADLESS, LIKE HydrographFigure: A PLAIN Figure ON ITS OWN Agg CANVAS, NO pyplot
+        self.fig = Figure(figsize=(2.2 * cols, 1.7 * rows))
+        FigureCanvasAgg(self.fig)
+        axes = self.fig.subplots(rows, cols, squeeze=False)
+        self.fig.subplots_adjust(left=0.06, right=0.98, bottom=0.05, top=0.95, wspace=0.35, hspace=0.6)
+        self.axes = axes.ravel().tolist()
+        self.lines = []
+        for ax in self.axes:
+            line, = ax.plot([], [], "b-", marker="P", markersize=2, linewidth=0.6)
+            self.lines.append(line)
+            ax.xaxis_date()
+            ax.xaxis.set_major_formatter(dates.DateFormatter("%Y"))
+            ax.tick_params(labelsize=5, length=2, pad=1)
+            ax.grid(visible=True, color="#cccccc", linewidth=0.4)
+
+    def update(self, batch):
+        """Draw up to rows x cols wells' arrays; unused cells are hidden."""
+        from matplotlib import dates
+
+        for i, (ax, line) in enumerate(zip(self.axes, self.lines)):
+            if i >= len(batch):
+                ax.set_visible(False)
+                continue
+            arrays = batch[i]
+            ax.set_visible(True)
+            line.set_data(dates.date2num(arrays["Date"]), arrays["WLE_Calc"])
+            ax.relim()
+            ax.autoscale_view(scalex=False)
+            xmin, xmax = dates.date2num(arrays["xmin"]), dates.date2num(arrays["xmax"])
+            ax.set_xlim(xmin, xmax)
+            ##ABOUT THREE YEAR LABELS PER THUMBNAIL, NEVER THE SAME YEAR TWICE
+            ##(A LOCATOR BELONGS TO ONE AXIS, SO EACH CELL GETS ITS OWN)
+            step = max(1, int(round((xmax - xmin) / 365.25 / 3)))
+            ax.xaxis.set_major_locator(dates.YearLocator(step))
+            ax.set_title(str(arrays[COL]), fontsize=6, pad=2)
+
+    def close(self):
+        self.fig.clear()
+
+
+def write_contact_sheets(prepared, outdir=".", rows=SHEET_ROWS, cols=SHEET_COLS, dpi=SHEET_DPI,
+                         pdf=False, prefix="Contact_Sheet_GWSI_Manual"):
+    """Write thumbnail sheets of ``rows`` x ``cols`` wells, as numbered PNGs or (``pdf=True``) one PDF."""
+    ready = _ready(prepared)
+    os.makedirs(outdir, exist_ok=True)
+    sheet = ContactSheet(rows, cols, dpi)
+    per_sheet = rows * cols
+    done = []
+
+    pages = None
+    if pdf:
+        from matplotlib.backends.backend_pdf import PdfPages
+
+        pdf_name = os.path.join(outdir, prefix + ".pdf")
+        pages = PdfPages(pdf_name)
+    try:
+        batch = []
+        t0 = time.perf_counter()
+
+        def flush():
+            sheet.update(batch)
+            if pages is not None:
+                pages.savefig(sheet.fig)
+                filename = pdf_name
+            else:
+                filename = os.path.join(outdir, "%s_%04d.png" % (prefix, len(done) + 1))
+                sheet.fig.savefig(filename, dpi=dpi)
+            done.append((filename, len(batch), time.perf_counter() - t0))
+
+        for arrays in iter_payloads(ready):
+            batch.append(arrays)
+            if len(batch) == per_sheet:
+                flush()
+                batch = []
+                t0 = time.perf_counter()
+        if batch:
+            flush()
+    finally:
+        if pages is not None:
+            pages.close()
+        sheet.close()
+    return done
@@ -0,0 +1,121 @@
+"""Columnar ingest cache for the GWSI source tables.
+
+``pd.read_excel`` on the statewide GWSI_WW_LEVELS.xlsx / GWSI_SITES.xlsx takes
+minutes.  The first time a source file is read, ``cached_read`` writes the
+resulting DataFrame to an uncompressed Feather (Arrow IPC) file; later runs
+reload that file instead of parsing the workbook again.  The reload maps the
+file and converts the columns into ordinary pandas memory, one copy with no
+parsing - fast, but not a zero-copy map shared between runs (the join sorts
+and filters the table straight after anyway).
+
+The cache file name carries a key in two parts: a stamp of the source
+(path, size and modification time, or with ``content_hash=True`` a SHA-1 of
+the file contents) and a hash of the columns kept.  Editing or replacing the
+source therefore misses the cache and rebuilds it, and cache files with an
+older stamp are removed.  Reads of the same source with other columns (the
+command line adds latitude/longitude for spatial selections) keep their own
+cache files side by side, so switching options does not re-read a workbook.
+
+Feather needs the optional ``pyarrow`` package.  Without it the source is
+read directly every time and a warning is issued once.
+"""
+import glob
+import hashlib
+import os
+import warnings
+
+CACHE_DIRNAME = "_gwsi_cache"
+_WARNED = []
+
+
+def _have_pyarrow():
+    try:
+        import pyarrow.feather  # noqa: F401
+    except ImportError:
+        if not _WARNED:
+            warnings.warn("pyarrow is not installed, GWSI tables will be read without the columnar cache")
+            _WARNED.append(True)
+        return False
+    return True
+
+
+def file_digest(filename, blocksize=1 << 20):
+    """Return the SHA-1 hex digest of a file's contents."""
+    digest = hashlib.sha1()
+    with open(filename, "rb") as fh:
+        for block in iter(lambda: fh.read(blocksize), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _sha1(text, digits):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:digits]
+
+
+def source_key(filename, kind, columns=None, content_hash=False):
+    """Return the cache key for ``filename`` read as ``kind`` keeping ``columns``.
+
+    The key is ``<source stamp>_<columns>``; every key of one copy of the
+    source starts with the same stamp.
+    """
+    if content_hash:
+        stamp = file_digest(filename)
+    else:
+        st = os.stat(filename)
+        stamp = "%s|%d|%d" % (os.path.abspath(filename), st.st_size, st.st_mtime_ns)
+    return "%s_%s" % (_sha1("%s|%s" % (stamp, kind), 16), _sha1(",".join(columns) if columns else "*", 8))
+
+
+def cache_path(filename, kind, key, cache_dir=None):
+    """Return the Feather file that holds ``filename`` for ``key``."""
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(filename)), CACHE_DIRNAME)
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    return os.path.join(cache_dir, "%s__%s__%s.feather" % (stem, kind, key))
+
+
+def _arrow_safe(df):
+    """Make object columns Arrow-friendly (excel code columns mix ints and strings)."""
+    df = df.reset_index(drop=True)
+    for name in df.columns[df.dtypes == object]:
+        values = df[name]
+        df[name] = values.where(values.isna(), values.astype(str))
+    return df
+
+
+def write_feather(df, path):
+    """Write ``df`` uncompressed (so it reloads without decompression), replacing ``path`` atomically."""
+    import pyarrow.feather as feather
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp%d" % os.getpid()
+    feather.write_feather(_arrow_safe(df), tmp, compression="uncompressed")
+    os.replace(tmp, path)
+
+
+def read_feather(path, columns=None):
+    """Return a cached Feather file as a DataFrame (read through a memory map, columns copied to pandas)."""
+    import pyarrow.feather as feather
+
+    return feather.read_table(path, columns=columns, memory_map=True).to_pandas()
+
+
+def cached_read(filename, reader, kind, columns=None, cache_dir=None, content_hash=False):
+    """Return ``reader(filename)``, served from the columnar cache when it is current."""
+    if not _have_pyarrow():
+        return reader(filename)
+
+    key = source_key(filename, kind, columns, content_hash)
+    path = cache_path(filename, kind, key, cache_dir)
+    if os.path.exists(path):
+        return read_feather(path)
+
+    df = reader(filename)
+    ##DROP CACHE FILES LEFT OVER FROM OLDER COPIES OF THE SAME SOURCE; KEEP THIS COPY'S OTHER COLUMN SETS
+    stamp = key.split("_", 1)[0]
+    for old in glob.glob(path.rsplit("__", 1)[0] + "__*.feather"):
+        if not os.path.basename(old).rsplit("__", 1)[1].startswith(stamp + "_"):
+            os.remove(old)
+    write_feather(df, path)
+    ##RE-OPEN FROM THE CACHE SO THE FIRST RUN SEES THE SAME DTYPES AS LATER RUNS
+    return read_feather(path)
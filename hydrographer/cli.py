@@ -0,0 +1,294 @@
+"""Command line entry point: ``python -m hydrographer render|export|stats``.
+
+The v2.x scripts are edited before every run - ``os.chdir(r"C:\\GIS\\ADWR\\PythonOutput")``,
+the ``GWSI_WW_LEVELS.xlsx`` / ``GWSI_SITES.xlsx`` file names and the well
+subset lists all live in the source.  Here they are options:
+
+   python -m hydrographer render --levels GWSI_ZIP_10182019.zip --sites GWSI_ZIP_10182019.zip
+                                 --bbox -111.6 31.8 -110.4 32.6 --outdir PythonOutput --workers 4
+   python -m hydrographer export --wells TucsonAMA_4557wells.csv --format parquet --outdir raw
+   python -m hydrographer stats  --polygon TucsonAMA_boundary.csv --out tucson_stats.csv
+                                 --exclude bad_wells.csv --quality-report tucson_quality.csv
+
+Every subcommand cleans the selected wells with the data-quality rules
+(``hydrographer.quality``); ``--legacy-clean`` gives v2.6's NaN -> 0 instead.
+
+matplotlib is only imported by the render subcommand (inside its workers),
+so export and stats start as fast as pandas does.
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+
+from .prepare import COL, prepare, read_well_list
+from .profiles import DEFAULT_PROFILE, PROFILES
+from .quality import LEGACY_RULES, RULES, WLE_TOLERANCE, code_filter, wle_mismatch
+from .readers import SITE_READ_COLUMNS, load_levels, load_sites
+from .stats import GAP_YEARS
+from .timing import RunTimer
+
+LEVELS_FILE = "GWSI_WW_LEVELS.xlsx"
+SITES_FILE = "GWSI_SITES.xlsx"
+STATS_FILE = "GWSI_well_stats.csv"
+
+
+def _add_common(parser):
+    inputs = parser.add_argument_group("input")
+    inputs.add_argument("--levels", default=LEVELS_FILE,
+                        help="GWSI_WW_LEVELS .xlsx/.txt or GWSI_ZIP .zip (default %(default)s)")
+    inputs.add_argument("--sites", default=SITES_FILE,
+                        help="GWSI_SITES .xlsx/.txt or GWSI_ZIP .zip (default %(default)s)")
+    inputs.add_argument("--cache-dir", default=None,
+                        help="folder for the columnar read cache (default _gwsi_cache beside the inputs)")
+    inputs.add_argument("--no-cache", action="store_true", help="always read the source files")
+
+    select = parser.add_argument_group("well selection (combined options keep wells matching all of them)")
+    select.add_argument("--wells", action="append", default=[], metavar="CSV",
+                        help="one-column WELL_SITE_ID list; repeat to combine lists")
+    select.add_argument("--bbox", nargs=4, type=float, metavar=("WEST", "SOUTH", "EAST", "NORTH"),
+                        help="decimal degree box")
+    select.add_argument("--radius", nargs=3, type=float, metavar=("LON", "LAT", "MILES"),
+                        help="wells within MILES of a point")
+    select.add_argument("--polygon", metavar="CSV", help="polygon vertices (lon, lat columns)")
+
+    quality = parser.add_argument_group("data quality")
+    quality.add_argument("--exclude", action="append", default=[], metavar="CSV",
+                         help="one-column WELL_SITE_ID list of wells to leave out (\"excluded\" in the report)")
+    quality.add_argument("--legacy-clean", action="store_true",
+                         help="set blank numbers to 0 and drop zero depths, as v2.6, instead of the quality rules")
+    quality.add_argument("--wle-tolerance", type=float, default=WLE_TOLERANCE, metavar="FT",
+                         help="flag WATER_LEVEL_ELEVATION off altitude - depth by more than this "
+                              "(default %(default)s ft)")
+    quality.add_argument("--drop-code", nargs=2, action="append", default=[], metavar=("COLUMN", "CODES"),
+                         help="drop rows whose COLUMN (REMARK_CODE, METHOD_CODE, SOURCE_CODE) is one of "
+                              "the comma-separated CODES; repeat for more columns")
+    quality.add_argument("--min-obs", type=int, default=1,
+                         help="leave out wells with fewer measurements left (default %(default)s)")
+    quality.add_argument("--quality-report", metavar="CSV", help="write the per-well data-quality report")
+
+    parser.add_argument("--outdir", default=".", help="output folder (default current folder)")
+
+    timing = parser.add_argument_group("timing")
+    timing.add_argument("--report", metavar="PATH",
+                        help="write a run report with stage times and per-well histograms (.json or .csv)")
+    timing.add_argument("--profile", action="store_true", help="run under cProfile (stats saved as REPORT.prof)")
+    timing.add_argument("--trace-memory", action="store_true", help="record the peak Python heap of each stage")
+
+
+def build_parser():
+    """Return the argparse parser for all subcommands."""
+    parser = argparse.ArgumentParser(prog="hydrographer", description=__doc__.split("\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    render = commands.add_parser("render", help="draw one hydrograph PNG per well")
+    _add_common(render)
+    render.add_argument("--output", choices=list(PROFILES), default=DEFAULT_PROFILE,
+                        help="output profile: resolution, format and layout (default %(default)s)")
+    render.add_argument("--dpi", type=int, default=None, help="override the profile's resolution")
+    render.add_argument("--workers", type=int, default=1, help="worker processes, 0 = one per core")
+    render.add_argument("--batch-size", type=int, default=None, help="wells per worker task")
+    render.add_argument("--encode-threads", type=int, default=0,
+                        help="compress and write PNGs on this many background threads per process "
+                             "while the next well is drawn (default 0, save in the drawing thread)")
+    render.add_argument("--png-level", type=int, choices=range(10), default=None, metavar="0-9",
+                        help="zlib level of the background PNG encoder (default 6, as savefig)")
+    render.add_argument("--transducer", metavar="ZIP",
+                        help="GWSI_ZIP .zip whose GWSI_TRANSDUCER_LEVELS.txt is overlaid on the manual levels")
+    render.add_argument("--manifest", metavar="CSV",
+                        help="run manifest; wells already drawn from the same data are skipped")
+    render.add_argument("--batch", choices=["png", "pdf", "sheets"], default="png",
+                        help="one file per well (png, the default), multi-page PDFs, or contact sheets")
+    render.add_argument("--per-file", type=int, default=None, help="wells per PDF (default 500)")
+    render.add_argument("--group-column", metavar="NAME",
+                        help="GWSI_SITES column (AMA, basin, ...) giving one PDF per value")
+
+    export = commands.add_parser("export", help="write the per-well raw data tables")
+    _add_common(export)
+    export.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    export.add_argument("--tag", default="Manual", help="tag in the CSV file names (default %(default)s)")
+
+    stats = commands.add_parser("stats", help="write one summary row per well")
+    _add_common(stats)
+    stats.add_argument("--out", default=None,
+                       help="output .csv or .parquet (default OUTDIR/%s)" % STATS_FILE)
+    stats.add_argument("--gap-years", type=float, default=GAP_YEARS,
+                       help="count gaps between measurements longer than this (default %(default)s years)")
+    return parser
+
+
+def _spatial(args):
+    return args.bbox is not None or args.radius is not None or args.polygon is not None
+
+
+def select_wells(args, sites):
+    """Return the WELL_SITE_IDs picked by the selection options, or None when there are none."""
+    selected = None
+
+    def keep(ids):
+        ids = np.asarray(ids, dtype=np.int64)
+        return ids if selected is None else np.intersect1d(selected, ids)
+
+    if args.wells:
+        selected = keep(np.unique(np.concatenate([read_well_list(name) for name in args.wells])))
+    if _spatial(args):
+        from .spatial import WellLocator, read_polygon
+
+        locator = WellLocator.from_sites(sites)
+        if args.bbox is not None:
+            selected = keep(locator.bbox(*args.bbox))
+        if args.radius is not None:
+            selected = keep(locator.radius(*args.radius))
+        if args.polygon is not None:
+            selected = keep(locator.polygon(read_polygon(args.polygon)))
+    return selected
+
+
+def load(args, timer):
+    """Read, join and select; return the PreparedWells for the chosen wells."""
+    from .spatial import LAT_COLUMNS, LON_COLUMNS
+
+    use_cache = not args.no_cache
+    columns = SITE_READ_COLUMNS
+    if _spatial(args):
+        ##KEEP LATITUDE/LONGITUDE IF GWSI_SITES HAS THEM; OTHERWISE THEY COME FROM THE SITE ID
+        columns = SITE_READ_COLUMNS + LAT_COLUMNS + LON_COLUMNS
+    if getattr(args, "group_column", None):
+        columns = columns + [args.group_column]
+    with timer.stage("read"):
+        df = load_levels(args.levels, cache_dir=args.cache_dir, use_cache=use_cache)
+        df2 = load_sites(args.sites, columns=columns, cache_dir=args.cache_dir, use_cache=use_cache)
+    df2 = df2.rename(columns={"SITE_WELL_SITE_ID": COL})
+
+    with timer.stage("select"):
+        selected = select_wells(args, df2)
+        if selected is not None:
+            ##SELECT BEFORE THE JOIN SO ONLY THE CHOSEN WELLS ARE SORTED
+            df = df[df[COL].isin(selected)]
+            df2 = df2[df2[COL].isin(selected)]
+    with timer.stage("join"):
+        return prepare(df, df2)
+
+
+def quality_rules(args):
+    """Return the data-quality rules picked by the options."""
+    if args.legacy_clean:
+        rules = list(LEGACY_RULES)
+    else:
+        rules = [wle_mismatch(args.wle_tolerance) if rule.name == "wle_mismatch" else rule for rule in RULES]
+    for column, codes in args.drop_code:
+        rules.append(code_filter(column, codes.split(",")))
+    return rules
+
+
+def clean(args, prepared, timer):
+    """Apply the data-quality options; return ``(ready, bad_wells)`` and write the report if asked."""
+    from .derive import clean as clean_wells
+
+    exclude = np.concatenate([read_well_list(name) for name in args.exclude]) if args.exclude else ()
+    with timer.stage("clean"):
+        ready, bad_wells, report = clean_wells(prepared, quality_rules(args), exclude, args.min_obs)
+    if args.quality_report:
+        os.makedirs(os.path.dirname(args.quality_report) or ".", exist_ok=True)
+        report.to_csv(args.quality_report)
+        print("quality: %s -> %s" % (", ".join("%d %s" % (count, status) for status, count
+                                               in report["status"].value_counts().items()),
+                                     args.quality_report))
+    return ready, bad_wells
+
+
+def run_batch(args, prepared, timer):
+    from .batch import WELLS_PER_FILE, write_contact_sheets, write_pdfs
+
+    with timer.stage("render"):
+        if args.batch == "pdf":
+            done = write_pdfs(prepared, args.outdir, groups=args.group_column,
+                              wells_per_file=args.per_file or WELLS_PER_FILE, dpi=args.dpi)
+        else:
+            done = write_contact_sheets(prepared, args.outdir)
+    print("wrote %d wells to %d %s files" % (sum(row[1] for row in done), len(set(row[0] for row in done)),
+                                             args.batch))
+    return 0
+
+
+def run_render(args, prepared, timer):
+    from .render import BATCH_SIZE, render_wells
+
+    ready, bad_wells = clean(args, prepared, timer)
+    if args.batch != "png":
+        return run_batch(args, ready, timer)
+
+    profile = PROFILES[args.output]
+    if args.dpi:
+        profile = profile._replace(dpi=args.dpi)
+    kwargs = {"outdir": args.outdir, "workers": args.workers or None, "profile": profile,
+              "batch_size": args.batch_size or BATCH_SIZE, "timer": timer,
+              "encode_threads": args.encode_threads, "compress_level": args.png_level}
+    if args.transducer:
+        from .gwsi_zip import read_zip_transducer
+        from .transducer import prepare_transducer
+
+        with timer.stage("transducer"):
+            kwargs["transducer"] = prepare_transducer(read_zip_transducer(args.transducer, wells=ready.ids))
+    with timer.stage("render"):
+        if args.manifest:
+            from .manifest import Manifest
+
+            with Manifest(args.manifest) as manifest:
+                done = render_wells(ready, manifest=manifest, **kwargs)
+        else:
+            done = render_wells(ready, **kwargs)
+    errors = [row for row in done if row[3] != "done"]
+    size = sum(os.path.getsize(row[1]) for row in done if row[3] == "done") / 2**20
+    print("rendered %d wells (%s, %.1f MB), %d errors, %d wells with no usable data"
+          % (len(done) - len(errors), profile.name, size, len(errors), len(bad_wells)))
+    for location, _, _, status in errors:
+        print("  %s %s" % (location, status), file=sys.stderr)
+    return 1 if errors else 0
+
+
+def run_export(args, prepared, timer):
+    from .export import export_csv, export_parquet
+
+    ready, _ = clean(args, prepared, timer)
+    with timer.stage("write"):
+        if args.format == "parquet":
+            result = export_parquet(ready, args.outdir)
+        else:
+            result = export_csv(ready, args.outdir, tag=args.tag)
+    print("exported %(wells)d wells (%(rows)d rows) in %(seconds).1f s" % result)
+    return 0
+
+
+def run_stats(args, prepared, timer):
+    from .stats import well_stats, write_stats
+
+    ready, _ = clean(args, prepared, timer)
+    with timer.stage("stats"):
+        stats = well_stats(ready, gap_years=args.gap_years)
+    out = args.out or os.path.join(args.outdir, STATS_FILE)
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with timer.stage("write"):
+        write_stats(stats, out)
+    print("wrote %d wells to %s" % (len(stats), out))
+    return 0
+
+
+COMMANDS = {"render": run_render, "export": run_export, "stats": run_stats}
+
+
+def main(argv=None):
+    """Run the command line; return the exit status."""
+    args = build_parser().parse_args(argv)
+    timer = RunTimer(profile=args.profile, trace_memory=args.trace_memory)
+    with timer:
+        prepared = load(args, timer)
+        print("%d wells, %d observations selected in %.1f s" % (len(prepared), len(prepared.table),
+                                                                 sum(timer.stages.values())))
+        status = COMMANDS[args.command](args, prepared, timer)
+    print(timer.format())
+    if args.report:
+        timer.write_report(args.report, command=args.command, wells=len(prepared),
+                           observations=len(prepared.table), argv=sys.argv[1:] if argv is None else argv)
+    return status
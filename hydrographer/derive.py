@@ -0,0 +1,82 @@
+"""Derived columns for the whole joined table in one pass.
+
+The v2.x loop works out WLE_Calc, Rise and the bottom elevation, fills NaN
+with 0 and drops the "zero error" rows separately for every well, paying
+pandas overhead thousands of times on tiny frames.  ``clean`` does the same
+arithmetic once over the prepared table:
+
+   WLE_Calc      = SITE_WELL_ALTITUDE - DEPTH_TO_WATER
+   Rise          = WATER_LEVEL_ELEVATION - (that well's minimum WATER_LEVEL_ELEVATION)
+   Well_Bot_Elev = SITE_WELL_ALTITUDE - SITE_WELL_DEPTH
+
+The per-well minimum is a segmented reduction (``np.fmin.reduceat`` over the
+well offsets, NaN-skipping like ``Series.min``).  Bad rows are then removed by
+the data-quality rules (``quality.validate``, ``quality.RULES`` unless told
+otherwise; ``quality.LEGACY_RULES`` are v2.6's NaN -> 0 and "zero error"
+drop).  The result is a ready-to-plot PreparedWells that the render loop only
+slices, and the per-well quality report.  ``derive`` is ``clean`` without
+the report.
+"""
+import numpy as np
+
+from .prepare import PreparedWells
+from .quality import RULES, validate
+
+DERIVED_COLUMNS = ["WLE_Calc", "Rise", "Well_Bot_Elev"]
+DECIMALS = 2
+
+
+def is_derived(prepared):
+    """True if ``prepared`` already went through ``derive``."""
+    return all(name in prepared.table.columns for name in DERIVED_COLUMNS)
+
+
+def segment_min(values, prepared):
+    """Return each well's NaN-skipping minimum of ``values``, repeated over the well's rows."""
+    if len(values) == 0:
+        return values.astype(float)
+    lengths = prepared.ends - prepared.starts
+    return np.repeat(np.fmin.reduceat(values, prepared.starts), lengths)
+
+
+def _floats(column):
+    """Column values as floats, keeping float32 (schema.py) as float32 and widening everything else."""
+    return column.to_numpy(dtype=np.result_type(column.dtype, np.float32))
+
+
+def _tidy(values):
+    """Round float32 results to the 0.01 ft of the measurements (3145.9 - 1103.0 is 2042.8999 in float32)."""
+    if values.dtype == np.float32:
+        return values.round(DECIMALS)
+    return values
+
+
+def derive_columns(prepared):
+    """Return ``prepared`` with the DERIVED_COLUMNS added (same wells and rows)."""
+    table = prepared.table
+    altitude = _floats(table["SITE_WELL_ALTITUDE"])
+    wle = _floats(table["WATER_LEVEL_ELEVATION"])
+    table = table.assign(WLE_Calc=_tidy(altitude - _floats(table["DEPTH_TO_WATER"])),
+                         Rise=_tidy(wle - segment_min(wle, prepared)),
+                         Well_Bot_Elev=_tidy(altitude - _floats(table["SITE_WELL_DEPTH"])))
+    return PreparedWells(table, prepared.ids, prepared.starts, prepared.ends)
+
+
+def clean(prepared, rules=None, exclude_wells=(), min_obs=1):
+    """Return ``(ready, bad_wells, report)``: the ready-to-plot wells, the bad wells and the quality report.
+
+    ``bad_wells`` are the wells left empty or rejected by a "drop_well" rule.
+
+    ``rules``, ``exclude_wells`` and ``min_obs`` go to ``quality.validate``
+    (``quality.RULES`` if ``rules`` is None).  Excluded wells are in the
+    report but not in ``bad_wells``.
+    """
+    ##RISE IS TAKEN OVER ALL OF A WELL'S ROWS BEFORE ANY ARE DROPPED, AS IN v2.6
+    ready, report = validate(derive_columns(prepared), RULES if rules is None else rules, exclude_wells, min_obs)
+    bad_wells = report.index[report["status"].isin(["empty", "rejected"]).to_numpy()].to_numpy()
+    return ready, bad_wells, report
+
+
+def derive(prepared, rules=None, exclude_wells=(), min_obs=1):
+    """Return ``(ready, bad_wells)`` - the cleaned, ready-to-plot wells and the bad wells (see ``clean``)."""
+    return clean(prepared, rules, exclude_wells, min_obs)[:2]
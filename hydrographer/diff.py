@@ -0,0 +1,88 @@
+"""Incremental regeneration between two GWSI releases.
+
+ADWR publishes new GWSI_ZIP snapshots (GWSI_ZIP_10182019, GWSI_ZIP_04142020,
+...) where only some wells gain measurements.  ``diff_fingerprints``
+compares the per-well fingerprints (``manifest.snapshot_fingerprints``) of
+two snapshots and sorts every WELL_SITE_ID into added / changed / removed /
+unchanged.  ``render_changed`` then draws only the added and changed wells.
+A well's transducer readings, when given, are part of its fingerprint, so a
+well whose only new data is transducer readings counts as changed.
+
+Fingerprints can be kept next to a release with ``save_fingerprints`` so the
+old snapshot does not have to be loaded again for the next comparison.
+"""
+import os
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .manifest import snapshot_fingerprints
+from .prepare import COL
+from .profiles import get_profile
+from .render import outname, render_wells
+
+
+class SnapshotDiff(namedtuple("SnapshotDiff", "added changed removed unchanged")):
+    """WELL_SITE_ID arrays of each kind of change between two snapshots."""
+
+    def counts(self):
+        """Return ``{"added": n, "changed": n, "removed": n, "unchanged": n}``."""
+        return {name: len(getattr(self, name)) for name in self._fields}
+
+
+def save_fingerprints(fingerprints, path):
+    """Write a fingerprint Series (indexed by WELL_SITE_ID) to CSV."""
+    fingerprints.rename("fingerprint").to_csv(path, header=True)
+
+
+def load_fingerprints(path):
+    """Read fingerprints written by ``save_fingerprints``."""
+    return pd.read_csv(path, index_col=COL, dtype={"fingerprint": str})["fingerprint"]
+
+
+def _fingerprints(snapshot, transducer=None):
+    return snapshot if isinstance(snapshot, pd.Series) else snapshot_fingerprints(snapshot, transducer)
+
+
+def diff_fingerprints(old, new, old_transducer=None, new_transducer=None):
+    """Compare two snapshots (PreparedWells or fingerprint Series) well by well.
+
+    ``old_transducer`` and ``new_transducer`` (``transducer.prepare_transducer``)
+    are the transducer readings of each PreparedWells snapshot.
+    """
+    old = _fingerprints(old, old_transducer)
+    new = _fingerprints(new, new_transducer)
+    both = old.index.intersection(new.index)
+    same = old.loc[both].to_numpy() == new.loc[both].to_numpy()
+    return SnapshotDiff(added=np.asarray(new.index.difference(old.index)),
+                        changed=np.asarray(both[~same]),
+                        removed=np.asarray(old.index.difference(new.index)),
+                        unchanged=np.asarray(both[same]))
+
+
+def render_changed(old, new_prepared, outdir=".", remove_stale=False, old_transducer=None, **render_kwargs):
+    """Render only the wells of ``new_prepared`` that are new or changed since ``old``.
+
+    ``old`` is the previous snapshot (PreparedWells or saved fingerprints,
+    with ``old_transducer`` for a PreparedWells); the new transducer readings
+    are the ``transducer`` of ``render_kwargs``.  With ``remove_stale``,
+    hydrographs of wells that left the release are deleted, as is the file
+    under the other name (manual or transducer) of each redrawn well.
+    Returns ``(diff, rendered)``; ``render_kwargs`` go to ``render_wells``.
+    """
+    diff = diff_fingerprints(old, new_prepared, old_transducer, render_kwargs.get("transducer"))
+    todo = new_prepared.subset(np.concatenate([diff.added, diff.changed]))
+    rendered = render_wells(todo, outdir, **render_kwargs)
+    if remove_stale:
+        profile = render_kwargs.get("profile")
+        ext = get_profile(profile).format if profile is not None else "png"
+        stale = [outname(location, outdir, ext, overlay)
+                 for location in diff.removed.tolist() for overlay in (False, True)]
+        stale += [outname(location, outdir, ext, overlay)
+                  for location, filename, _, status in rendered if status == "done"
+                  for overlay in (False, True) if outname(location, outdir, ext, overlay) != filename]
+        for filename in stale:
+            if os.path.exists(filename):
+                os.remove(filename)
+    return diff, rendered
@@ -0,0 +1,71 @@
+"""Background PNG encoding, overlapped with drawing the next well.
+
+``fig.savefig(outname, dpi=400, bbox_inches='tight')`` draws the figure,
+compresses the PNG and writes the file before the loop can move on to the
+next well; at 400 dpi the zlib pass and the write are a large part of each
+well's time.  With a ``PngWriter`` the drawing thread only renders the
+figure to an RGBA array (``HydrographFigure.draw``) and hands it over:
+
+   writer = PngWriter(threads=2, compress_level=6)
+   future = writer.submit(figure.draw(arrays), filename, dpi)   ## returns at once
+   ...                                                         ## draw the next well
+   seconds = future.result()                                   ## encode + write time
+
+The encoding runs in a small thread pool (Pillow's zlib encoder and the file
+write release the GIL), so it overlaps the next well's drawing.  At most
+``max_pending`` arrays are waiting or being encoded; ``submit`` blocks
+when that many are in flight, so a slow disk holds the drawing back instead
+of letting the arrays (about 20 MB each at 400 dpi) pile up in memory.
+
+``compress_level`` is the zlib level, 0-9: savefig uses 6; 1 is several
+times faster for files about a third larger.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ENCODE_THREADS = 2
+COMPRESS_LEVEL = 6
+
+
+def write_png(rgba, filename, dpi, compress_level=COMPRESS_LEVEL):
+    """Encode an RGBA array (rows x columns x 4, uint8) to ``filename``; return the seconds it took."""
+    from PIL import Image
+
+    t0 = time.perf_counter()
+    Image.fromarray(rgba).save(filename, format="png", compress_level=compress_level, dpi=(dpi, dpi))
+    return time.perf_counter() - t0
+
+
+class PngWriter:
+    """Encode RGBA arrays to PNG files on a bounded pool of threads."""
+
+    def __init__(self, threads=ENCODE_THREADS, compress_level=COMPRESS_LEVEL, max_pending=None):
+        self.compress_level = compress_level
+        self.pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="png")
+        ##ONE ARRAY BEING ENCODED PER THREAD PLUS ONE WAITING FOR EACH, UNLESS TOLD OTHERWISE
+        self.slots = threading.BoundedSemaphore(max_pending or 2 * threads)
+
+    def submit(self, rgba, filename, dpi):
+        """Queue ``rgba`` to be written to ``filename``; return a Future of the seconds it took.
+
+        Blocks while ``max_pending`` arrays are already in flight.
+        """
+        self.slots.acquire()
+        try:
+            future = self.pool.submit(write_png, rgba, filename, dpi, self.compress_level)
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        return future
+
+    def close(self):
+        """Wait for every queued file to be written and stop the threads."""
+        self.pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
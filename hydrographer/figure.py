@@ -0,0 +1,167 @@
+"""Reusable hydrograph figure.
+
+The v2.x loop calls ``plt.figure()`` and ``twinx()`` for every well and
+never closes the figure, so memory grows with every well until matplotlib
+warns about too many open figures; ``plt.rcParams`` is also changed inside
+the loop.
+
+``HydrographFigure`` builds the twin-axis template once - depth to water on
+an inverted left axis, water level elevation on the right axis in green,
+year ticks, grid, rotated date labels - and for each well only replaces the
+line data, the axis limits, the year locator and the title.  One figure is
+used for the whole run, so memory stays flat, and the time spent on each
+well is kept in ``times``.
+
+A PNG is made in the steps savefig goes through, each timed on its own
+(``last_split``, in the order of ``timing.SPLIT_SAMPLES``): replace the data
+("plot"), measure the tight bbox savefig would use ("tight"), rasterize the
+figure cropped to that bbox with savefig's raw "rgba" format ("draw"), and
+compress and write it (``encode.write_png``, "savefig").  The pixels are
+those of ``savefig(..., bbox_inches="tight", pad_inches=.1)``; the bbox can
+reach past the edge of the canvas, over the right-hand axis label, so it is
+passed to savefig rather than cut out of the canvas.  ``draw`` stops before
+the encoding and returns the array, for the background PNG encoder
+(``hydrographer.encode.PngWriter``).
+
+With ``tight=False`` the margins are fixed once (``FIXED_LAYOUT``) and the
+tight bbox is not measured.  SVG and PDF files go through savefig in one
+step, timed as "savefig".
+
+The figure is a plain ``matplotlib.figure.Figure`` on its own
+``FigureCanvasAgg``; pyplot is never imported.  There is no figure manager,
+no GUI backend and no ``plt.show()`` to block, the figure is not registered
+anywhere (it is freed like any other object), and it runs on servers
+without a display whatever backend matplotlib is configured with.
+"""
+import io
+import os
+import time
+
+import matplotlib
+import numpy as np
+from matplotlib import dates
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from .encode import write_png
+from .metadata import axis_limits, title
+
+##STYLE THE v2.x SCRIPTS SET THROUGH plt.rcParams, APPLIED ONCE WHEN THE TEMPLATE IS BUILT
+STYLE = {"xtick.labelsize": 8, "font.size": 12}
+DPI = 400
+PAD_INCHES = .1
+##MARGINS THAT FIT THE TITLE, BOTH Y LABELS AND THE ROTATED YEARS WHEN THE TIGHT BBOX IS NOT COMPUTED
+FIXED_LAYOUT = {"left": 0.13, "right": 0.86, "bottom": 0.14, "top": 0.9}
+##TRANSDUCER DEPTHS (hydrographer.transducer) UNDER THE MANUAL MEASUREMENTS ON THE DEPTH AXIS
+TRANSDUCER_STYLE = {"color": "#ff7f0e", "linewidth": 0.6, "zorder": 1}
+
+
+class HydrographFigure:
+    """One twin-axis hydrograph figure, redrawn for each well."""
+
+    def __init__(self, dpi=DPI, tight=True):
+        self.dpi = dpi
+        self.tight = tight
+        self.times = []
+        self.last_split = (0.0, 0.0, 0.0, 0.0)
+        with matplotlib.rc_context(STYLE):
+            ##AT THE OUTPUT DPI, SO THE TIGHT BBOX IS MEASURED WITH THE SAME TEXT METRICS savefig USES
+            self.fig = fig = Figure(dpi=dpi)
+            FigureCanvasAgg(fig)
+            self.ax1 = ax1 = fig.add_subplot(111)
+            self.ax2 = ax2 = ax1.twinx()
+
+            self.dtw_line, = ax1.plot([], [])
+            self.transducer_line, = ax1.plot([], [], **TRANSDUCER_STYLE)
+            ax1.set_ylabel("Depth to Water [ft bgs]")
+            ax1.invert_yaxis()
+
+            self.wle_line, = ax2.plot([], [], "b-")
+            self.wle_marks, = ax2.plot([], [], "bP")
+            ax2.set_ylabel("Water Level Elevation [ft amsl]", color="g")
+            ##tick_params SETTINGS SURVIVE NEW TICKS, UNLIKE LOOPING OVER get_yticklabels()
+            ax2.tick_params(axis="y", labelcolor="g")
+
+            self.suptitle = fig.suptitle("", fontsize=12)
+            ax1.grid(visible=True, which="major", color="#666666", linestyle="-")
+            ax1.xaxis_date()
+            ax1.xaxis.set_major_formatter(dates.DateFormatter("%Y"))
+            ##TICKS ARE RE-CREATED WHEN THE LOCATOR CHANGES, SO THE STYLE IS PINNED WITH tick_params
+            ax1.tick_params(axis="x", labelrotation=90, labelsize=STYLE["xtick.labelsize"])
+            for ax in (ax1, ax2):
+                ax.tick_params(axis="y", labelsize=STYLE["font.size"])
+            self.locators = {1: dates.YearLocator(1), 2: dates.YearLocator(2)}
+            if not tight:
+                fig.subplots_adjust(**FIXED_LAYOUT)
+
+    def update(self, arrays):
+        """Replace the line data, limits, year locator and title with one well's values."""
+        x = dates.date2num(arrays["Date"])
+        self.dtw_line.set_data(x, arrays["DEPTH_TO_WATER"])
+        self.wle_line.set_data(x, arrays["WLE_Calc"])
+        self.wle_marks.set_data(x, arrays["WLE_Calc"])
+        if "transducer_Date" in arrays:
+            self.transducer_line.set_data(dates.date2num(arrays["transducer_Date"]), arrays["transducer_DTW"])
+        else:
+            self.transducer_line.set_data([], [])
+        for ax in (self.ax1, self.ax2):
+            ax.relim()
+            ax.autoscale_view(scalex=False)
+
+        ##LIMITS, TICKS AND TITLE COME PRE-COMPUTED FROM metadata.well_metadata WHEN RENDERING IN BULK
+        if "xmin" in arrays:
+            xmin, xmax, x_ticks, text = arrays["xmin"], arrays["xmax"], arrays["x_ticks"], arrays["title"]
+        else:
+            (xmin, xmax, x_ticks), text = axis_limits(arrays["Date"]), title(arrays)
+        self.ax1.set_xlim(dates.date2num(xmin), dates.date2num(xmax))
+        self.ax1.xaxis.set_major_locator(self.locators[x_ticks])
+        self.suptitle.set_text(text)
+
+    def save(self, filename, dpi=None, **kwargs):
+        if self.tight:
+            self.fig.savefig(filename, dpi=dpi or self.dpi, bbox_inches="tight", pad_inches=PAD_INCHES, **kwargs)
+        else:
+            self.fig.savefig(filename, dpi=dpi or self.dpi, **kwargs)
+
+    def _rgba(self, arrays):
+        """Update and rasterize the figure; return the RGBA array and the (plot, tight, draw) seconds."""
+        t0 = time.perf_counter()
+        self.update(arrays)
+        t1 = time.perf_counter()
+        bbox = None
+        if self.tight:
+            bbox = self.fig.get_tightbbox(self.fig.canvas.get_renderer()).padded(PAD_INCHES)
+        t2 = time.perf_counter()
+        raw = io.BytesIO()
+        self.fig.savefig(raw, format="rgba", dpi=self.dpi, bbox_inches=bbox)
+        ##THE CANVAS KEEPS THE RENDERER OF THE LAST DRAW, WHICH HAS THE SIZE AND DPI OF THE OUTPUT
+        renderer = self.fig.canvas.renderer
+        rgba = np.frombuffer(raw.getbuffer(), np.uint8).reshape(int(renderer.height), int(renderer.width), 4)
+        return rgba, (t1 - t0, t2 - t1, time.perf_counter() - t2)
+
+    def render(self, arrays, filename):
+        """Update the figure for one well and save it; return the seconds it took."""
+        if os.path.splitext(filename)[1].lower() == ".png":
+            rgba, split = self._rgba(arrays)
+            split += (write_png(rgba, filename, self.dpi),)
+        else:
+            t0 = time.perf_counter()
+            self.update(arrays)
+            t1 = time.perf_counter()
+            self.save(filename)
+            split = (t1 - t0, 0.0, 0.0, time.perf_counter() - t1)
+        elapsed = sum(split)
+        self.last_split = split
+        self.times.append(elapsed)
+        return elapsed
+
+    def draw(self, arrays):
+        """Update the figure for one well and return it as an RGBA array (rows x columns x 4, uint8)."""
+        rgba, split = self._rgba(arrays)
+        self.last_split = split + (0.0,)
+        self.times.append(sum(split))
+        return rgba
+
+    def close(self):
+        """Drop the figure's artists; nothing is registered with pyplot, so there is nothing else to close."""
+        self.fig.clear()
@@ -0,0 +1,133 @@
+"""Streaming reader for the ADWR GWSI_ZIP_*.zip download.
+
+Every GWSI release has been extracted by hand before running the grapher
+(see the zipfile notes at the bottom of v2.5 and v2.6).  These functions
+read the Data_Tables text files straight out of a local copy of the zip, in
+chunks, so nothing is written to disk and only the columns (and wells) that
+are asked for are ever held in memory:
+
+   iter_zip_table(zip_path, "levels")        ## chunks of GWSI_WW_LEVELS.txt
+   read_zip_levels(zip_path)                 ## whole levels table
+   read_zip_sites(zip_path, columns)         ## GWSI_SITES.txt, pruned
+   read_zip_transducer(zip_path, wells)      ## GWSI_TRANSDUCER_LEVELS.txt
+
+Peak memory is one chunk of raw text plus the kept rows/columns, no matter
+how large the archive is.
+"""
+import zipfile
+
+import pandas as pd
+
+from .prepare import COL, COL_NAMES
+from .schema import apply_levels_schema, apply_sites_schema
+
+##FILES INSIDE <GWSI_ZIP_xxxxxxxx>/Data_Tables/
+TABLES = {"levels": "GWSI_WW_LEVELS.txt",
+          "sites": "GWSI_SITES.txt",
+          "transducer": "GWSI_TRANSDUCER_LEVELS.txt"}
+
+CHUNKSIZE = 250_000
+
+##DTYPE HINTS FOR THE LEVELS TABLE (COLUMNS ARE NAMED BY POSITION WITH COL_NAMES, AS IN THE EXCEL READ)
+##CODES ARE READ AS TEXT AND MADE CATEGORICAL AFTER THE CHUNKS ARE JOINED (schema.apply_schema):
+##CATEGORICAL CHUNKS WITH DIFFERENT CODES WOULD CONCATENATE BACK TO OBJECT.
+##THE KEYS ARE NULLABLE Int64 SO A BLANK ONE DOES NOT STOP THE READ; apply_schema DROPS THOSE ROWS
+##AND MAKES THE COLUMNS int64 / int32, AS FOR THE EXCEL AND .txt READS
+LEVELS_DTYPES = {"WELL_SITE_ID": "Int64", "ID": "Int64",
+                 "DEPTH_TO_WATER": "float32", "WATER_LEVEL_ELEVATION": "float32",
+                 "SOURCE_CODE": str, "METHOD_CODE": str, "REMARK_CODE": str}
+
+##THE TRANSDUCER TABLE IS MATCHED BY KEYWORD, ITS HEADER IS NOT PART OF THE GWSI PROTOCOL LIST
+TRANSDUCER_KEYWORDS = {COL: "SITE_ID", "Date": "DATE", "DEPTH_TO_WATER": "DEPTH",
+                       "WATER_LEVEL_ELEVATION": "ELEV"}
+
+
+def find_member(zf, table):
+    """Return the archive member name of ``table`` ("levels", "sites", "transducer" or a file name)."""
+    target = TABLES.get(table, table).lower()
+    for name in zf.namelist():
+        if name.lower().rsplit("/", 1)[-1] == target:
+            return name
+    raise KeyError("%s not found in %s" % (target, zf.filename))
+
+
+def read_zip_header(zip_path, table):
+    """Return the column names of ``table`` without reading any rows."""
+    with zipfile.ZipFile(zip_path) as zf, zf.open(find_member(zf, table)) as fh:
+        return list(pd.read_csv(fh, nrows=0).columns)
+
+
+def iter_zip_table(zip_path, table, chunksize=CHUNKSIZE, wells=None, **read_csv_kwargs):
+    """Yield DataFrame chunks of ``table`` read directly from ``zip_path``.
+
+    ``read_csv_kwargs`` go to ``pd.read_csv`` (usecols, names, dtype, ...).
+    If ``wells`` is given, each chunk is cut to those WELL_SITE_IDs before
+    it is yielded.
+    """
+    keep = None if wells is None else pd.Index(wells)
+    with zipfile.ZipFile(zip_path) as zf, zf.open(find_member(zf, table)) as fh:
+        for chunk in pd.read_csv(fh, chunksize=chunksize, index_col=False, **read_csv_kwargs):
+            if keep is not None:
+                chunk = chunk[chunk[COL].isin(keep)]
+            yield chunk
+
+
+def _concat(chunks, columns):
+    chunks = list(chunks)
+    if not chunks:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def read_zip_levels(zip_path, wells=None, chunksize=CHUNKSIZE):
+    """Read GWSI_WW_LEVELS.txt from the zip with the GWSI Protocol column names."""
+    chunks = iter_zip_table(zip_path, "levels", chunksize, wells,
+                            header=0, names=COL_NAMES, usecols=range(len(COL_NAMES)),
+                            dtype=LEVELS_DTYPES, parse_dates=["Date"])
+    return apply_levels_schema(_concat(chunks, COL_NAMES))
+
+
+def read_zip_sites(zip_path, columns=None, chunksize=CHUNKSIZE):
+    """Read GWSI_SITES.txt from the zip, keeping only ``columns`` (None keeps all)."""
+    usecols = None if columns is None else (lambda name: name in columns)
+    return apply_sites_schema(_concat(iter_zip_table(zip_path, "sites", chunksize, usecols=usecols), columns))
+
+
+def transducer_columns(header):
+    """Map the transducer table's header to WELL_SITE_ID / Date / DEPTH_TO_WATER / WATER_LEVEL_ELEVATION."""
+    found = {}
+    for target, keyword in TRANSDUCER_KEYWORDS.items():
+        for name in header:
+            if keyword in name.upper() and name not in found:
+                found[name] = target
+                break
+    missing = set(TRANSDUCER_KEYWORDS) - set(found.values()) - {"WATER_LEVEL_ELEVATION"}
+    if missing:
+        raise KeyError("transducer table has no column for %s" % ", ".join(sorted(missing)))
+    return found
+
+
+def read_zip_transducer(zip_path, wells=None, chunksize=CHUNKSIZE):
+    """Read GWSI_TRANSDUCER_LEVELS.txt from the zip, optionally only for ``wells``.
+
+    Transducer wells can have millions of readings, so pass ``wells`` when
+    only a subset is needed - rows of other wells are dropped chunk by chunk.
+    Rows with a blank well key are dropped.
+    """
+    rename = transducer_columns(read_zip_header(zip_path, "transducer"))
+    ##NULLABLE KEY, AS FOR THE LEVELS (LEVELS_DTYPES): ROWS WITHOUT ONE ARE DROPPED AND THE REST MADE int64
+    dtypes = {name: ("Int64" if target == COL else "float32")
+              for name, target in rename.items() if target != "Date"}
+
+    keep = None if wells is None else pd.Index(wells)
+
+    def renamed(chunks):
+        for chunk in chunks:
+            chunk = chunk.rename(columns=rename)
+            chunk = chunk[chunk[COL].notna().to_numpy()].astype({COL: "int64"})
+            if keep is not None:
+                chunk = chunk[chunk[COL].isin(keep)]
+            yield chunk.assign(Date=pd.to_datetime(chunk["Date"]))
+
+    chunks = iter_zip_table(zip_path, "transducer", chunksize, usecols=list(rename), dtype=dtypes)
+    return _concat(renamed(chunks), list(rename.values()))
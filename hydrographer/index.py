@@ -0,0 +1,97 @@
+"""Well-indexed observation store.
+
+Versions 2.2, 2.3 and 2.5 pull each well out of the statewide tables with
+``df.loc[df[col] == location]`` plus four ``df2[df2[col] == location][...]``
+lookups (SITE_WELL_ALTITUDE, WELL_BOT, SITE_WELL_DEPTH, SITE_WELL_REG_ID).
+Every one of those is a full-column scan, so the loop is quadratic in the
+number of wells.
+
+``WellIndex`` sorts the observations by (WELL_SITE_ID, Date) one time and
+keeps each column as a contiguous NumPy array with per-well start/end
+offsets.  Site attributes are kept in arrays keyed by WELL_SITE_ID.  A
+well's observations are then plain array slices (views, no copy) and its
+site attributes are a dictionary lookup.
+"""
+import numpy as np
+import pandas as pd
+
+from .prepare import COL, COL_START, well_offsets
+
+##SITE ATTRIBUTES USED BY THE GRAPHER (Well_Bot_Elev is WELL_BOT in v2.2 - v2.5)
+SITE_COLUMNS = ["SITE_WELL_ALTITUDE", "Well_Bot_Elev", "SITE_WELL_DEPTH", "SITE_WELL_REG_ID"]
+
+
+class WellIndex:
+    """Sorted, contiguous observation arrays with O(1) per-well lookup.
+
+    ``df`` is the GWSI_WW_LEVELS table, ``df2`` the GWSI_SITES table (keyed
+    by SITE_WELL_SITE_ID or WELL_SITE_ID).  Only ``columns`` of ``df`` are
+    kept; by default all of them.
+    """
+
+    def __init__(self, df, df2, columns=None, site_columns=SITE_COLUMNS):
+        columns = list(df.columns) if columns is None else list(columns)
+        if COL not in columns:
+            columns.insert(0, COL)
+
+        ##ONE SORT FOR THE WHOLE TABLE: BY WELL, THEN BY DATE
+        keys = df[COL].to_numpy()
+        order = np.lexsort((df["Date"].to_numpy(), keys))
+        self.columns = {name: np.ascontiguousarray(df[name].to_numpy()[order]) for name in columns}
+        self.ids, self.starts, self.ends = well_offsets(self.columns[COL])
+        self._obs_row = {location: i for i, location in enumerate(self.ids.tolist())}
+
+        ##SITE ATTRIBUTES, ONE ROW PER WELL (FIRST RECORD WINS, AS .iloc[0] DID)
+        df2 = df2.rename(columns={COL_START: COL})
+        if "Well_Bot_Elev" not in df2.columns:
+            df2 = df2.assign(Well_Bot_Elev=df2["SITE_WELL_ALTITUDE"] - df2["SITE_WELL_DEPTH"])
+        df2 = df2.drop_duplicates(COL, keep="first").sort_values(COL, kind="mergesort")
+        self.site_ids = df2[COL].to_numpy()
+        self.sites = {name: df2[name].to_numpy() for name in site_columns if name in df2.columns}
+        self._site_row = {location: i for i, location in enumerate(self.site_ids.tolist())}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, location):
+        return location in self._obs_row
+
+    def __iter__(self):
+        return iter(self.ids.tolist())
+
+    def bounds(self, location):
+        """Return the ``(start, end)`` row offsets of ``location``."""
+        i = self._obs_row[location]
+        return self.starts[i], self.ends[i]
+
+    def observations(self, location, columns=None):
+        """Return ``{column: array}`` for one well.  The arrays are views, not copies."""
+        start, end = self.bounds(location)
+        names = self.columns if columns is None else columns
+        return {name: self.columns[name][start:end] for name in names}
+
+    def frame(self, location, columns=None):
+        """Return one well's observations as a DataFrame, sorted by Date."""
+        return pd.DataFrame(self.observations(location, columns), copy=False)
+
+    def site(self, location):
+        """Return ``{attribute: value}`` for one well (KeyError if it has no site record)."""
+        i = self._site_row[location]
+        return {name: values[i] for name, values in self.sites.items()}
+
+    def has_site(self, location):
+        return location in self._site_row
+
+    def site_values(self, name, wells=None):
+        """Return site attribute ``name`` for ``wells`` (default: every observed well).
+
+        Wells without a site record get NaN.
+        """
+        wells = self.ids if wells is None else np.asarray(wells)
+        values = self.sites[name].astype(float)
+        pos = np.searchsorted(self.site_ids, wells)
+        pos = np.minimum(pos, max(len(self.site_ids) - 1, 0))
+        found = (self.site_ids[pos] == wells) if len(self.site_ids) else np.zeros(len(wells), bool)
+        out = np.full(len(wells), np.nan)
+        out[found] = values[pos[found]]
+        return out
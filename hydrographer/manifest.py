@@ -0,0 +1,135 @@
+"""Completion manifest for resumable batch runs.
+
+v2.5 resumed a crashed statewide run by hand (``skiplines = 4176-19`` and
+``wells = wells[skiplines:]`` on an unordered set).  A ``Manifest`` is a CSV
+file written as the run goes, one line per finished well:
+
+   WELL_SITE_ID, input_hash, output_path, status, duration
+
+``input_hash`` is a fingerprint of the well's joined rows and, when they
+are overlaid, its transducer readings (see ``snapshot_fingerprints``), salted with the output profile the well was drawn
+with (``combine_fingerprints``), so a quicklook run does not make a later
+publication run into the same folder skip every well.  On restart a well is skipped when its last line
+says "done" (or "empty") with the same fingerprint and the output file is
+still there, so an interrupted run picks up where it stopped and wells whose
+data changed are drawn again.
+"""
+import csv
+import os
+
+import numpy as np
+import pandas as pd
+
+from .prepare import COL
+
+##COLUMNS THAT CHANGE WHAT A HYDROGRAPH LOOKS LIKE
+FINGERPRINT_COLUMNS = ["Date", "DEPTH_TO_WATER", "WATER_LEVEL_ELEVATION",
+                       "SITE_WELL_ALTITUDE", "SITE_WELL_DEPTH", "SITE_WELL_REG_ID"]
+TRANSDUCER_COLUMNS = ["Date", "DEPTH_TO_WATER"]
+MANIFEST_FIELDS = [COL, "input_hash", "output_path", "status", "duration"]
+SKIP_STATUS = ("done", "empty")
+
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+def row_hashes(table, columns=FINGERPRINT_COLUMNS):
+    """Return one uint64 hash per row of ``table`` over ``columns`` (those present)."""
+    columns = [name for name in columns if name in table.columns]
+    return pd.util.hash_pandas_object(table[columns], index=False).to_numpy()
+
+
+def well_fingerprints(prepared, columns=FINGERPRINT_COLUMNS):
+    """Return a Series of 16-hex-digit fingerprints indexed by WELL_SITE_ID.
+
+    Computed for all wells at once: each row hash is mixed with its position
+    inside the well (so reordering counts as a change), then XOR-reduced over
+    each well's offsets.
+    """
+    if len(prepared) == 0:
+        return pd.Series([], index=pd.Index(prepared.ids, name=COL), dtype=object)
+    hashes = row_hashes(prepared.table, columns)
+    lengths = prepared.ends - prepared.starts
+    position = np.arange(len(hashes)) - np.repeat(prepared.starts, lengths)
+    with np.errstate(over="ignore"):
+        mixed = pd.util.hash_array(hashes ^ (position.astype(np.uint64) * _MIX))
+    folded = np.bitwise_xor.reduceat(mixed, prepared.starts) ^ lengths.astype(np.uint64)
+    return pd.Series(["%016x" % value for value in folded.tolist()],
+                     index=pd.Index(prepared.ids, name=COL))
+
+
+def combine_fingerprints(fingerprints, *others, salt=None):
+    """Return ``fingerprints`` with ``others`` and ``salt`` folded into each well's value.
+
+    ``others`` are more fingerprint Series indexed by WELL_SITE_ID; a well
+    missing from one of them keeps the value it has without it.  ``salt``
+    (any text, such as the output profile) changes every fingerprint alike.
+    """
+    values = np.array([int(value, 16) for value in fingerprints.tolist()], dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for other in others:
+            extra = other.reindex(fingerprints.index)
+            has = extra.notna().to_numpy()
+            extra = np.array([int(value, 16) for value in extra[has].tolist()], dtype=np.uint64)
+            values[has] = pd.util.hash_array(values[has] ^ (extra * _MIX))
+        if salt is not None:
+            values ^= pd.util.hash_array(np.array([str(salt)], dtype=object))[0]
+    return pd.Series(["%016x" % value for value in values.tolist()], index=fingerprints.index)
+
+
+def snapshot_fingerprints(prepared, transducer=None):
+    """Return ``well_fingerprints(prepared)`` with each well's ``transducer`` readings folded in.
+
+    ``transducer`` is a PreparedWells from ``transducer.prepare_transducer``;
+    wells without readings get the same fingerprint as without it.
+    """
+    fingerprints = well_fingerprints(prepared)
+    if transducer is None:
+        return fingerprints
+    return combine_fingerprints(fingerprints, well_fingerprints(transducer, TRANSDUCER_COLUMNS))
+
+
+class Manifest:
+    """Append-only CSV record of finished wells; the last line for a well wins."""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, newline="") as fh:
+                for row in csv.DictReader(fh):
+                    self.entries[int(row[COL])] = row
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._fh = open(path, "a", newline="")
+        self._writer = csv.writer(self._fh)
+        if new:
+            self._writer.writerow(MANIFEST_FIELDS)
+            self._fh.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def is_current(self, location, input_hash, output_path):
+        """True if ``location`` already finished with this input and its output still exists."""
+        row = self.entries.get(location)
+        if row is None or row["input_hash"] != input_hash or row["status"] not in SKIP_STATUS:
+            return False
+        return row["status"] == "empty" or os.path.exists(output_path)
+
+    def record(self, location, input_hash, output_path, status, duration):
+        """Write one line and flush it, so a crash loses at most the well being drawn."""
+        row = [location, input_hash, output_path, status, "%.4f" % duration]
+        self._writer.writerow(row)
+        self._fh.flush()
+        self.entries[location] = dict(zip(MANIFEST_FIELDS, [str(value) for value in row]))
+
+    def close(self):
+        if not self._fh.closed:
+            self._fh.close()
@@ -0,0 +1,81 @@
+"""Per-well metadata table: date range, axis limits, tick interval and title.
+
+For every well the v2.x loop finds the first and last Date, rounds them out
+to Jan 1 of the first year and Jan 1 of the year after the last one
+(``replace(month=1).replace(day=1)`` and ``DateOffset(years=1)``) and picks
+year ticks every 1 or 2 years from ``total_years_float > 40``.
+
+``well_metadata`` does all of that for every well in one pass with
+datetime64 arithmetic on the well offsets of a ready (``derive``-d) table,
+and returns one row per WELL_SITE_ID.  The render stage reads its limits,
+tick interval and title from this table, and other outputs can reuse it.
+"""
+import numpy as np
+import pandas as pd
+
+from .prepare import COL
+
+YEARS_FOR_2YR_TICKS = 40
+DAYS_PER_YEAR = 365.25
+
+METADATA_COLUMNS = ["n_obs", "min_date", "max_date", "xmin", "xmax", "total_years_float", "x_ticks",
+                    "SITE_WELL_REG_ID", "SITE_WELL_DEPTH", "title"]
+
+
+def _year_floor(values):
+    return values.astype("datetime64[Y]").astype("datetime64[ns]")
+
+
+def well_metadata(ready):
+    """Return the metadata table (indexed by WELL_SITE_ID) for every well in ``ready``."""
+    table = ready.table
+    starts = ready.starts
+    dates = table["Date"].to_numpy().astype("datetime64[ns]")
+    min_date = dates[starts]
+    max_date = dates[ready.ends - 1]
+
+    ##WHOLE DAYS BETWEEN FIRST AND LAST MEASUREMENT, LIKE Timedelta.days
+    total_days = (max_date - min_date) // np.timedelta64(1, "D")
+    total_years_float = total_days / DAYS_PER_YEAR
+    xmin = _year_floor(min_date)
+    xmax = (max_date.astype("datetime64[Y]") + 1).astype("datetime64[ns]")
+
+    reg_id = table["SITE_WELL_REG_ID"].to_numpy()[starts]
+    depth = table["SITE_WELL_DEPTH"].to_numpy()[starts]
+    meta = pd.DataFrame({"n_obs": ready.ends - starts,
+                         "min_date": min_date, "max_date": max_date,
+                         "xmin": xmin, "xmax": xmax,
+                         "total_years_float": total_years_float,
+                         "x_ticks": np.where(total_years_float > YEARS_FOR_2YR_TICKS, 2, 1),
+                         "SITE_WELL_REG_ID": reg_id, "SITE_WELL_DEPTH": depth},
+                        index=pd.Index(ready.ids, name=COL))
+    meta["title"] = titles(meta.index, reg_id, depth)
+    return meta
+
+
+def titles(locations, reg_id, depth):
+    """Return the v2.6 figure titles for arrays of wells, registry ids and depths."""
+    reg = pd.Series(np.nan_to_num(np.asarray(reg_id, dtype=float))).astype(np.int64).astype(str)
+    dep = pd.Series(np.nan_to_num(np.asarray(depth, dtype=float))).astype(np.int64).astype(str)
+    site = pd.Series(np.asarray(locations)).astype(str)
+    return ("GWSI Site: " + site + ", RegID: 55-" + reg + ", Depth: " + dep + " ft").to_numpy()
+
+
+def _whole(value):
+    """``int(value)``, with a blank as 0 like ``titles``."""
+    return 0 if pd.isna(value) else int(value)
+
+
+def title(arrays):
+    """Return the v2.6 figure title for one well's arrays (blank registry id or depth shown as 0)."""
+    return "GWSI Site: %s, RegID: 55-%d, Depth: %d ft" % (
+        arrays[COL], _whole(arrays["SITE_WELL_REG_ID"]), _whole(arrays["SITE_WELL_DEPTH"]))
+
+
+def axis_limits(dates_):
+    """Return (xmin, xmax, x_ticks) for one well's sorted dates (single-well version)."""
+    first = np.datetime64(dates_[0], "ns")
+    last = np.datetime64(dates_[-1], "ns")
+    total_years_float = ((last - first) // np.timedelta64(1, "D")) / DAYS_PER_YEAR
+    return (_year_floor(first), (last.astype("datetime64[Y]") + 1).astype("datetime64[ns]"),
+            2 if total_years_float > YEARS_FOR_2YR_TICKS else 1)
@@ -0,0 +1,162 @@
+"""Observations binned into model stress periods, for all wells at once.
+
+MODFLOW stress periods need one head per well and period, but GWSI manual
+measurements are irregular - some wells have several a year, others one a
+decade.  ``aggregate`` bins every observation of the ready (``derive``-d)
+table into a period table and reduces each well x period cell to one value:
+
+   mean      average of the measurements in the period
+   median    middle measurement (mean of the middle two)
+   nearest   the measurement closest to the middle of the period
+
+A period table has one row per period (numbered from 1, like IREFSP) with
+``start`` and ``end`` dates; a date belongs to the period with
+``start <= date < end``, and dates between periods (or outside the model)
+are left out.  Tables are built by
+
+   annual_periods(start, end)              calendar years
+   seasonal_periods(start, end, months)    periods starting in ``months`` each year
+   period_table(starts, end)               any start dates and the model end (an
+                                           existing stress period setup)
+   read_stress_periods(csv)                a start, end CSV
+
+The period of every row comes from one ``searchsorted`` of the sorted dates
+in the period starts; the reductions are ``bincount`` sums and a single
+``lexsort`` of the (well, period) cells, so no per-well ``resample`` is
+ever called.  The result is a dense DataFrame, WELL_SITE_ID x period, NaN
+where a well has no measurement in a period; ``period_observations`` and
+``write_period_observations`` turn it into PEST observations.
+"""
+import numpy as np
+import pandas as pd
+
+from .pest import write_pest_observations
+from .prepare import COL
+
+SEASON_MONTHS = (1, 4, 7, 10)
+METHODS = ("mean", "median", "nearest")
+
+
+def period_table(starts, end):
+    """Return the period table for the period ``starts`` and ``end``.
+
+    ``end`` is the model end date, each period running to the next start
+    (the ``period_starts, end`` of ``pest.observation_table``), or one end
+    date per period when the periods do not follow on from each other.
+    """
+    starts = np.asarray(pd.to_datetime(starts), dtype="datetime64[ns]")
+    if np.ndim(end) == 0:
+        ends = np.r_[starts[1:], np.datetime64(pd.Timestamp(end), "ns")]
+    else:
+        ends = np.asarray(pd.to_datetime(end), dtype="datetime64[ns]")
+    if len(starts) != len(ends) or (ends <= starts).any() or (starts[1:] < ends[:-1]).any():
+        raise ValueError("stress periods must be in order, not overlap, and end after they start")
+    table = pd.DataFrame({"start": starts, "end": ends},
+                         index=pd.RangeIndex(1, len(starts) + 1, name="period"))
+    table["mid"] = table["start"] + (table["end"] - table["start"]) / 2
+    return table
+
+
+def annual_periods(start, end):
+    """Return calendar-year periods from the year of ``start`` through the year of ``end``."""
+    first, last = pd.Timestamp(start).year, pd.Timestamp(end).year
+    edges = pd.to_datetime(["%d-01-01" % year for year in range(first, last + 2)])
+    return period_table(edges[:-1], edges[-1])
+
+
+def seasonal_periods(start, end, months=SEASON_MONTHS):
+    """Return periods starting on the 1st of each of ``months`` every year (e.g. (4, 10), spring and fall)."""
+    first, last = pd.Timestamp(start).year, pd.Timestamp(end).year
+    ##FROM THE YEAR BEFORE: A SEASON STARTED THEN CAN HOLD ``start``
+    edges = pd.to_datetime(["%d-%02d-01" % (year, month) for year in range(first - 1, last + 2)
+                            for month in sorted(months)])
+    ##KEEP THE PERIOD HOLDING ``start`` AND THE ONE HOLDING ``end``, DROP WHOLE PERIODS OUTSIDE
+    first_edge = np.searchsorted(edges, pd.Timestamp(start), side="right") - 1
+    last_edge = np.searchsorted(edges, pd.Timestamp(end), side="right")
+    return period_table(edges[first_edge:last_edge], edges[last_edge])
+
+
+def read_stress_periods(filename):
+    """Read a period table from a CSV with start and end date columns (any case), one row per period."""
+    table = pd.read_csv(filename)
+    names = {name.lower(): name for name in table.columns}
+    return period_table(table[names["start"]], table[names["end"]])
+
+
+def _reduce(cells, values, n_cells, how, distance=None):
+    out = np.full(n_cells, np.nan)
+    if not len(cells):
+        return out
+    if how == "mean":
+        counts = np.bincount(cells, minlength=n_cells)
+        sums = np.bincount(cells, weights=values, minlength=n_cells)
+        seen = counts > 0
+        out[seen] = sums[seen] / counts[seen]
+        return out
+    ##SORT EACH CELL'S ROWS BY VALUE (median) OR BY DISTANCE FROM THE PERIOD MIDDLE (nearest)
+    order = np.lexsort((values if how == "median" else distance, cells))
+    cells, values = cells[order], values[order]
+    first = np.flatnonzero(np.r_[True, cells[1:] != cells[:-1]])
+    counts = np.diff(np.r_[first, len(cells)])
+    if how == "median":
+        out[cells[first]] = (values[first + (counts - 1) // 2] + values[first + counts // 2]) / 2
+    else:
+        out[cells[first]] = values[first]
+    return out
+
+
+def aggregate(ready, periods, how="mean", value_column="WLE_Calc"):
+    """Return the dense WELL_SITE_ID x period table of ``value_column`` reduced with ``how``."""
+    if how not in METHODS:
+        raise ValueError("unknown aggregation %r, expected one of %s" % (how, ", ".join(METHODS)))
+    starts = periods["start"].to_numpy().astype("datetime64[ns]")
+    ends = periods["end"].to_numpy().astype("datetime64[ns]")
+    table = ready.table
+    dates = table["Date"].to_numpy().astype("datetime64[ns]")
+    values = table[value_column].to_numpy(dtype=float)
+
+    ##PERIOD OF EVERY ROW AT ONCE; ROWS BEFORE THE FIRST START, AFTER ITS PERIOD'S END OR NaN ARE LEFT OUT
+    period = np.searchsorted(starts, dates, side="right") - 1
+    inside = period >= 0
+    inside[inside] = dates[inside] < ends[period[inside]]
+    inside &= ~np.isnan(values)
+    well = np.repeat(np.arange(len(ready)), ready.ends - ready.starts)
+
+    n_periods = len(periods)
+    cells = well[inside] * n_periods + period[inside]
+    distance = None
+    if how == "nearest":
+        mids = periods["mid"].to_numpy().astype("datetime64[ns]")
+        distance = np.abs((dates[inside] - mids[period[inside]]).astype(np.int64))
+    out = _reduce(cells, values[inside], len(ready) * n_periods, how, distance)
+    return pd.DataFrame(out.reshape(len(ready), n_periods),
+                        index=pd.Index(ready.ids, name=COL), columns=periods.index)
+
+
+def period_observations(dense, decimals=2):
+    """Return the filled cells of ``aggregate``'s table as PEST observations, one row per cell.
+
+    Columns: WELL_SITE_ID, well_no, period, OBSNAM (wNNNNN_pPPPP, the
+    well's row number and the period number) and HOBS.
+    """
+    values = dense.to_numpy()
+    well_no, period = np.nonzero(~np.isnan(values))
+    obs = pd.DataFrame({COL: dense.index.to_numpy()[well_no],
+                        "well_no": well_no + 1,
+                        "period": dense.columns.to_numpy()[period],
+                        "HOBS": values[well_no, period].round(decimals)})
+    obs["OBSNAM"] = ("w" + pd.Series(obs["well_no"]).map("{:05d}".format) + "_p"
+                     + pd.Series(obs["period"]).map("{:04d}".format)).to_numpy()
+    return obs[[COL, "well_no", "period", "OBSNAM", "HOBS"]]
+
+
+def write_period_observations(dense, prefix, weight=1.0, group="heads"):
+    """Write ``<prefix>_periods.csv`` (the dense table), ``<prefix>.obs.txt`` and ``<prefix>_names.csv``.
+
+    Returns the observation table from ``period_observations``.
+    """
+    dense.to_csv(prefix + "_periods.csv")
+    obs = period_observations(dense)
+    write_pest_observations(obs, prefix + ".obs.txt", weight, group)
+    obs[["OBSNAM", COL, "period", "HOBS"]].to_csv(prefix + "_names.csv", index=False)
+    return obs
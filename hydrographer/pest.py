@@ -0,0 +1,142 @@
+"""MODFLOW head-observation (HOB) and PEST files straight from the joined table.
+
+The grapher exists to prepare MODFLOW model inputs and PEST calibration
+targets, but so far the observations were assembled by hand from the PNGs
+and raw data tables.  This module turns the ready (``derive``-d) table into
+
+   <prefix>.hob        MODFLOW-2005 HOB package, one multi-time observation
+                       block per well (IREFSP = -NT, ITT = 1)
+   <prefix>.ins        PEST instruction file for the HOB output file (IUHOBSV)
+   <prefix>.obs.txt    PEST "* observation data" section (name, value, weight, group)
+   <prefix>_names.csv  observation name -> WELL_SITE_ID and Date
+
+for every selected well at once.  The stress period (IREFSP) and time
+offset (TOFFSET) of each measurement come from a ``searchsorted`` of its
+Date in the stress-period start dates; the text lines are built with
+vectorized string formatting and written chunk by chunk.
+
+Well placement in the model grid (LAYER, ROW, COLUMN, ROFF, COFF) is not in
+GWSI - pass it as a DataFrame indexed by WELL_SITE_ID, e.g. from a GIS
+intersect of GWSI_SITES with the model grid.  Only single-layer
+observations are written (no MLAY/PR proportions).
+"""
+import numpy as np
+import pandas as pd
+
+from .prepare import COL
+
+GRID_COLUMNS = ["LAYER", "ROW", "COLUMN", "ROFF", "COFF"]
+TIME_UNITS = {"seconds": 86400.0, "minutes": 1440.0, "hours": 24.0, "days": 1.0, "years": 1 / 365.25}
+HOBDRY = -999.0
+IUHOBSV = 40     ##UNIT OF THE HOB OUTPUT FILE, ADD IT TO THE NAME FILE AS A DATA FILE
+CHUNK_LINES = 100_000
+HOBS_DECIMALS = 2
+
+
+def observation_table(ready, grid, period_starts, end, time_units="days", value_column="WLE_Calc"):
+    """Return one row per head observation inside the model period.
+
+    ``grid`` is indexed by WELL_SITE_ID with GRID_COLUMNS; wells not in it
+    are skipped.  ``period_starts`` are the start dates of the stress
+    periods (the first is the model start) and ``end`` is the model end date.
+    Columns: WELL_SITE_ID, well_no, OBSNAM, Date, IREFSP, TOFFSET, HOBS and
+    GRID_COLUMNS.
+    """
+    table = ready.table
+    starts = np.asarray(pd.to_datetime(period_starts), dtype="datetime64[ns]")
+    end = np.datetime64(pd.Timestamp(end), "ns")
+    dates = table["Date"].to_numpy().astype("datetime64[ns]")
+
+    in_model = (dates >= starts[0]) & (dates < end) & table[COL].isin(grid.index).to_numpy()
+    obs = pd.DataFrame({COL: table[COL].to_numpy()[in_model],
+                        "Date": dates[in_model],
+                        ##ROUNDED TO THE 0.01 FT OF THE MEASUREMENTS, SO float32 COLUMNS DO NOT PRINT AS x.8999
+                        "HOBS": table[value_column].to_numpy(dtype=float)[in_model].round(HOBS_DECIMALS)})
+
+    ##STRESS PERIOD AND OFFSET FROM ITS START, FOR ALL MEASUREMENTS AT ONCE
+    period = np.searchsorted(starts, obs["Date"].to_numpy(), side="right") - 1
+    elapsed_days = (obs["Date"].to_numpy() - starts[period]) / np.timedelta64(1, "D")
+    obs["IREFSP"] = period + 1
+    obs["TOFFSET"] = elapsed_days * TIME_UNITS[time_units]
+
+    ##OBSERVATION NAMES: wNNNNN_KKKK (WELL NUMBER, MEASUREMENT NUMBER) - 11 CHARACTERS, FITS HOB'S 12
+    well_no = pd.factorize(obs[COL], sort=True)[0] + 1
+    first = np.r_[True, well_no[1:] != well_no[:-1]]
+    group_start = np.maximum.accumulate(np.where(first, np.arange(len(obs)), 0))
+    obs_no = np.arange(len(obs)) - group_start + 1
+    obs["well_no"] = well_no
+    obs["OBSNAM"] = ("w" + pd.Series(well_no).map("{:05d}".format) + "_"
+                     + pd.Series(obs_no).map("{:04d}".format)).to_numpy()
+    obs = obs.join(grid[GRID_COLUMNS], on=COL)
+    return obs[[COL, "well_no", "OBSNAM", "Date", "IREFSP", "TOFFSET", "HOBS"] + GRID_COLUMNS]
+
+
+def _write_lines(fh, lines):
+    for first in range(0, len(lines), CHUNK_LINES):
+        fh.write("\n".join(lines[first:first + CHUNK_LINES]))
+        fh.write("\n")
+
+
+def hob_lines(obs):
+    """Return the per-well HOB lines (header, ITT, observations) in file order."""
+    firsts = obs.drop_duplicates("well_no")
+    counts = obs.groupby("well_no", sort=True).size().to_numpy()
+    headers = ("w" + firsts["well_no"].map("{:05d}".format) + " "
+               + firsts["LAYER"].astype(int).astype(str) + " "
+               + firsts["ROW"].astype(int).astype(str) + " "
+               + firsts["COLUMN"].astype(int).astype(str) + " "
+               + pd.Series(-counts, index=firsts.index).astype(str) + " 0.0 "
+               + firsts["ROFF"].map("{:.4f}".format) + " "
+               + firsts["COFF"].map("{:.4f}".format) + " 0.0")
+    rows = (obs["OBSNAM"] + " " + obs["IREFSP"].astype(str) + " "
+            + obs["TOFFSET"].map("{:.4f}".format) + " " + obs["HOBS"].map("{:.4f}".format))
+
+    ##INTERLEAVE: EACH WELL'S HEADER AND "1" (ITT = HEADS) LINE GO RIGHT BEFORE ITS OBSERVATIONS
+    n_wells = len(firsts)
+    lines = np.empty(len(obs) + 2 * n_wells, dtype=object)
+    header_at = np.arange(n_wells) * 2 + np.r_[0, np.cumsum(counts)[:-1]]
+    lines[header_at] = headers.to_numpy()
+    lines[header_at + 1] = "1"
+    body = np.ones(len(lines), dtype=bool)
+    body[header_at] = body[header_at + 1] = False
+    lines[body] = rows.to_numpy()
+    return lines.tolist()
+
+
+def write_hob(obs, path, iuhobsv=IUHOBSV, hobdry=HOBDRY, tomulth=1.0):
+    """Write the MODFLOW-2005 HOB package file for ``obs`` (from ``observation_table``)."""
+    n_wells = obs["well_no"].nunique()
+    with open(path, "w", newline="\n") as fh:
+        fh.write("# HOB file written by hydrographer from GWSI manual water levels\n")
+        fh.write("%d 0 %d %d %g\n" % (len(obs), 1, iuhobsv, hobdry))
+        fh.write("%g\n" % tomulth)
+        if n_wells:
+            _write_lines(fh, hob_lines(obs))
+
+
+def write_pest_instructions(obs, path, marker="#"):
+    """Write a PEST instruction file reading the simulated values from the HOB output file."""
+    with open(path, "w", newline="\n") as fh:
+        fh.write("pif %s\n" % marker)
+        fh.write("l1\n")        ##HEADER LINE OF THE IUHOBSV FILE
+        _write_lines(fh, ("l1 !" + obs["OBSNAM"] + "!").tolist())
+
+
+def write_pest_observations(obs, path, weight=1.0, group="heads"):
+    """Write the ``* observation data`` section of a PEST control file."""
+    weights = pd.Series(np.broadcast_to(weight, len(obs)), index=obs.index)
+    with open(path, "w", newline="\n") as fh:
+        fh.write("* observation data\n")
+        _write_lines(fh, (obs["OBSNAM"] + " " + obs["HOBS"].map("{:.4f}".format) + " "
+                          + weights.map("{:g}".format) + " " + group).tolist())
+
+
+def write_observation_files(ready, grid, period_starts, end, prefix, time_units="days",
+                            value_column="WLE_Calc", weight=1.0, group="heads", iuhobsv=IUHOBSV):
+    """Write the .hob, .ins, .obs.txt and _names.csv files for all wells in ``grid``; return the table."""
+    obs = observation_table(ready, grid, period_starts, end, time_units, value_column)
+    write_hob(obs, prefix + ".hob", iuhobsv=iuhobsv)
+    write_pest_instructions(obs, prefix + ".ins")
+    write_pest_observations(obs, prefix + ".obs.txt", weight, group)
+    obs[["OBSNAM", COL, "Date", "HOBS"]].to_csv(prefix + "_names.csv", index=False)
+    return obs
@@ -0,0 +1,122 @@
+"""Prepare stage - join GWSI observations to well construction data ONCE.
+
+Versions 2.2 through 2.6 of the grapher build each well's DataFrame inside
+the ``for location in wells:`` loop.  In v2.6 that loop called
+``pd.merge(df, df2, on="WELL_SITE_ID")`` for every well, so the statewide
+GWSI_WW_LEVELS x GWSI_SITES join was rebuilt ~40,000 times.
+
+``prepare`` does the join a single time, sorts the result by
+(WELL_SITE_ID, Date) and records where each well's rows start and end.
+The plotting loop then gets each well as a positional slice of the joined
+table, so the cost per well is proportional to that well's own rows.
+"""
+import numpy as np
+import pandas as pd
+
+##COLUMN NAMES based on GWSI Protocol, used when reading the levels table
+COL = "WELL_SITE_ID"
+COL_START = "SITE_WELL_SITE_ID"
+COL_NAMES = ["WELL_SITE_ID", "ID", "Date", "DEPTH_TO_WATER", "WATER_LEVEL_ELEVATION",
+             "SOURCE_CODE", "METHOD_CODE", "REMARK_CODE"]
+
+
+def well_offsets(keys):
+    """Return ``(ids, starts, ends)`` for an array of well keys that is already sorted.
+
+    Rows ``starts[i]:ends[i]`` of the sorted table belong to well ``ids[i]``.
+    """
+    keys = np.asarray(keys)
+    if len(keys) == 0:
+        empty = np.zeros(0, dtype=np.intp)
+        return keys[:0], empty, empty.copy()
+    change = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+    starts = np.concatenate(([0], change)).astype(np.intp)
+    ends = np.concatenate((change, [len(keys)])).astype(np.intp)
+    return keys[starts], starts, ends
+
+
+class PreparedWells:
+    """Joined observation + site table sorted by (WELL_SITE_ID, Date).
+
+    Iterating yields ``(location, frame)`` pairs, where ``frame`` is the
+    positional slice of ``table`` holding that well's rows in date order.
+    """
+
+    def __init__(self, table, ids=None, starts=None, ends=None):
+        self.table = table
+        if ids is None:
+            ids, starts, ends = well_offsets(table[COL].to_numpy())
+        self.ids = ids
+        self.starts = starts
+        self.ends = ends
+        self._position = {location: i for i, location in enumerate(ids.tolist())}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, location):
+        return location in self._position
+
+    def __iter__(self):
+        table = self.table
+        for i, location in enumerate(self.ids.tolist()):
+            yield location, table.iloc[self.starts[i]:self.ends[i]]
+
+    def position(self, location):
+        """Return the row number of ``location`` in ``ids`` (KeyError if absent)."""
+        return self._position[location]
+
+    def well(self, location):
+        """Return the rows of one well, sorted by Date."""
+        i = self._position[location]
+        return self.table.iloc[self.starts[i]:self.ends[i]]
+
+    def row_counts(self):
+        """Return a Series of observation counts indexed by WELL_SITE_ID."""
+        return pd.Series(self.ends - self.starts, index=pd.Index(self.ids, name=COL))
+
+    def groupby(self):
+        """Return ``table`` grouped by well, in the same order as ``ids``."""
+        return self.table.groupby(COL, sort=False)
+
+    def subset(self, wells):
+        """Return a new PreparedWells holding only ``wells`` (unknown ids are ignored)."""
+        keep = np.isin(self.ids, np.asarray(list(wells), dtype=self.ids.dtype))
+        lengths = (self.ends - self.starts)[keep]
+        ends = np.cumsum(lengths).astype(np.intp)
+        starts = (ends - lengths).astype(np.intp)
+        ##ROW NUMBERS OF THE KEPT WELLS, WITHOUT A PYTHON LOOP OVER WELLS
+        rows = np.arange(ends[-1] if len(ends) else 0) + np.repeat(self.starts[keep] - starts, lengths)
+        table = self.table.iloc[rows].reset_index(drop=True)
+        return PreparedWells(table, self.ids[keep], starts, ends)
+
+
+def prepare(df, df2):
+    """Join observations ``df`` to site construction data ``df2`` once and index by well.
+
+    ``df`` is the GWSI_WW_LEVELS table read with ``COL_NAMES``; ``df2`` is
+    GWSI_SITES, with either ``SITE_WELL_SITE_ID`` or ``WELL_SITE_ID`` as
+    its key.  Wells without a site record are dropped by the inner join, as
+    they were in the per-well merge.
+    """
+    df2 = df2.rename(columns={COL_START: COL})
+    if "Well_Bot_Elev" not in df2.columns:
+        df2 = df2.assign(Well_Bot_Elev=df2["SITE_WELL_ALTITUDE"] - df2["SITE_WELL_DEPTH"])
+
+    table = pd.merge(df, df2, on=COL)
+    ##MERGESORT IS STABLE, SO SAME-DAY OBSERVATIONS KEEP THEIR FILE ORDER
+    table = table.sort_values([COL, "Date"], kind="mergesort", ignore_index=True)
+    return PreparedWells(table)
+
+
+def read_well_list(filename):
+    """Read a one-column list of WELL_SITE_IDs (CSV, with or without a header row).
+
+    Handles the files the scripts have written, e.g. ``pd.DataFrame(wells).to_csv(...)``
+    (header "0") and the headerless ``GWSI_WLE_ZipExtract__TucsonAMA_4557wells.csv``.
+    """
+    values = pd.read_csv(filename, header=None, usecols=[0], dtype=str)[0]
+    wells = pd.to_numeric(values.str.strip(), errors="coerce").dropna()
+    ##A HEADER ROW IS EITHER TEXT (-> NaN) OR THE "0" COLUMN NAME PANDAS WRITES
+    wells = wells[wells > 0]
+    return np.unique(wells.astype(np.int64).to_numpy())
@@ -0,0 +1,81 @@
+"""Output profiles - resolution, format and layout of the hydrographs, per run.
+
+Every v2.x hydrograph is saved with ``dpi=400, bbox_inches='tight'``; at that
+setting savefig is most of the time spent on a well, and the PNGs are a few
+hundred KB (see Hydrographs_GWSI_314015111033401__Transducer.png).  That is
+right for reports but wasteful for a QA pass over the whole state.  A
+profile picks:
+
+   quicklook     100 dpi PNG, fixed margins, no tight-bbox pass
+   publication   400 dpi PNG with the tight bbox, as v2.x
+   svg / pdf     vector output with the tight bbox
+
+``render_wells(..., profile="quicklook")`` uses one; ``compare_profiles``
+draws the same wells with each profile and reports the time per well and the
+file sizes, so the cost of each choice is measured rather than guessed.
+"""
+import os
+import time
+from collections import namedtuple
+
+import pandas as pd
+
+OutputProfile = namedtuple("OutputProfile", "name format dpi tight")
+
+PROFILES = {
+    "quicklook": OutputProfile("quicklook", "png", 100, False),
+    "publication": OutputProfile("publication", "png", 400, True),
+    "svg": OutputProfile("svg", "svg", 400, True),
+    "pdf": OutputProfile("pdf", "pdf", 400, True),
+}
+DEFAULT_PROFILE = "publication"
+
+
+def get_profile(profile):
+    """Return the OutputProfile for a name in PROFILES (an OutputProfile is returned as is)."""
+    if isinstance(profile, OutputProfile):
+        return profile
+    try:
+        return PROFILES[profile]
+    except KeyError:
+        raise ValueError("unknown output profile %r, expected one of %s"
+                         % (profile, ", ".join(PROFILES))) from None
+
+
+def compare_profiles(ready, outdir, profiles=tuple(PROFILES), sample=20):
+    """Draw the first ``sample`` wells of ``ready`` with each profile; return one row per profile.
+
+    Columns: profile, format, dpi, tight, wells, seconds_per_well,
+    mean_kb, total_kb.  Files go to ``outdir/<profile>/``.
+    """
+    from .figure import HydrographFigure
+    from .metadata import well_metadata
+    from .prepare import COL
+    from .render import iter_payloads, outname
+
+    meta = well_metadata(ready)
+    payloads = []
+    for arrays in iter_payloads(ready, meta=meta):
+        if len(payloads) == sample:
+            break
+        payloads.append(arrays)
+
+    rows = []
+    for name in profiles:
+        profile = get_profile(name)
+        folder = os.path.join(outdir, profile.name)
+        os.makedirs(folder, exist_ok=True)
+        figure = HydrographFigure(profile.dpi, tight=profile.tight)
+        sizes = []
+        t0 = time.perf_counter()
+        for arrays in payloads:
+            filename = outname(arrays[COL], folder, profile.format)
+            figure.render(arrays, filename)
+            sizes.append(os.path.getsize(filename))
+        seconds = time.perf_counter() - t0
+        figure.close()
+        n = max(len(payloads), 1)
+        rows.append({"profile": profile.name, "format": profile.format, "dpi": profile.dpi,
+                     "tight": profile.tight, "wells": len(payloads), "seconds_per_well": seconds / n,
+                     "mean_kb": sum(sizes) / n / 1024, "total_kb": sum(sizes) / 1024})
+    return pd.DataFrame(rows)
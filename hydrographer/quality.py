@@ -0,0 +1,146 @@
+"""Data-quality rules, evaluated over the whole joined table in one pass.
+
+Until now bad data was handled by ``df4.fillna(value=0, inplace=True)`` and
+dropping DEPTH_TO_WATER == 0 inside the per-well loop, plus a hand-kept
+``bad_wells`` list in v2.5 (with duplicates).  Here each check is a
+declarative ``Rule``:
+
+   name         column in the quality report
+   action       "drop"      - remove the rows that fail
+                "drop_well" - remove the whole well if any row fails
+                "flag"      - keep the rows, only count them
+                "fill_zero" - keep the rows, with their blank numbers set to 0
+   test         function(table) -> boolean Series/array, True where a row fails
+   description  one line for people reading the report
+
+``validate`` evaluates every rule as a vectorized mask over the prepared
+table, removes dropped rows and wells, and returns the remaining wells with a
+per-well report, so no time is spent drawing figures that would be thrown
+away.  Wells that used to be listed by hand go in ``exclude_wells`` (see
+``prepare.read_well_list``).  ``derive.clean`` runs it for every command.
+
+``RULES`` drop what cannot be plotted, so a well without SITE_WELL_ALTITUDE
+is left out instead of being drawn at an elevation of 0.  ``LEGACY_RULES``
+are the v2.6 step, spelled out: blanks to 0, then drop the "zero errors".
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .prepare import COL, PreparedWells
+
+ACTIONS = ("drop", "drop_well", "flag", "fill_zero")
+WLE_TOLERANCE = 1.0     ##FEET
+
+
+class Rule(namedtuple("Rule", "name action test description")):
+    """One declarative data-quality check (see module docstring)."""
+
+    def mask(self, table):
+        """Return a boolean array, True where a row of ``table`` fails this rule."""
+        failed = self.test(table)
+        if isinstance(failed, pd.Series):
+            failed = failed.to_numpy(dtype=bool, na_value=False)
+        return np.asarray(failed, dtype=bool)
+
+
+def wle_mismatch(tolerance=WLE_TOLERANCE, action="flag"):
+    """Rule: reported WATER_LEVEL_ELEVATION differs from altitude minus depth by more than ``tolerance``."""
+    def test(t):
+        calc = t["SITE_WELL_ALTITUDE"] - t["DEPTH_TO_WATER"]
+        return (t["WATER_LEVEL_ELEVATION"] - calc).abs() > tolerance
+    return Rule("wle_mismatch", action, test,
+                "WATER_LEVEL_ELEVATION differs from SITE_WELL_ALTITUDE - DEPTH_TO_WATER by more than %g ft"
+                % tolerance)
+
+
+def code_filter(column, codes, action="drop"):
+    """Rule: ``column`` (REMARK_CODE, METHOD_CODE, SOURCE_CODE) is one of ``codes``."""
+    codes = [str(code) for code in codes]
+    return Rule("%s_filter" % column, action, lambda t: t[column].astype(str).isin(codes),
+                "%s is one of %s" % (column, ", ".join(codes)))
+
+
+RULES = [
+    Rule("nan_depth", "drop", lambda t: t["DEPTH_TO_WATER"].isna(), "DEPTH_TO_WATER is blank"),
+    Rule("zero_depth", "drop", lambda t: t["DEPTH_TO_WATER"] == 0, "DEPTH_TO_WATER is 0 (\"zero error\")"),
+    Rule("nan_altitude", "drop", lambda t: t["SITE_WELL_ALTITUDE"].isna(),
+         "no SITE_WELL_ALTITUDE, water level elevation cannot be calculated"),
+    wle_mismatch(),
+    Rule("below_bottom", "flag", lambda t: t["SITE_WELL_ALTITUDE"] - t["DEPTH_TO_WATER"] < t["Well_Bot_Elev"],
+         "water level is below the bottom of the well (Well_Bot_Elev)"),
+]
+
+LEGACY_RULES = [
+    Rule("blank_to_zero", "fill_zero", lambda t: t.select_dtypes("number").isna().any(axis=1),
+         "a numeric value is blank and set to 0 (v2.6 fillna)"),
+    Rule("zero_depth", "drop", lambda t: t["DEPTH_TO_WATER"] == 0, "DEPTH_TO_WATER is 0 (\"zero error\")"),
+]
+
+
+def _per_well(values, prepared):
+    """Sum ``values`` (one per row) over each well's offsets."""
+    if len(prepared) == 0:
+        return np.zeros(0, dtype=np.int64)
+    return np.add.reduceat(values.astype(np.int64), prepared.starts)
+
+
+def validate(prepared, rules=RULES, exclude_wells=(), min_obs=1):
+    """Apply ``rules`` to ``prepared``; return ``(good, report)``.
+
+    ``good`` is a PreparedWells with failing rows and wells removed.
+    ``report`` has one row per well: n_obs, n_kept, the number of rows that
+    failed each rule, ``status`` ("ok", "flagged", "empty", "rejected",
+    "excluded") and ``reasons``.  Wells on ``exclude_wells`` are "excluded",
+    wells removed by a "drop_well" rule "rejected", and wells with fewer
+    than ``min_obs`` rows left "empty".
+
+    Rules are evaluated in order on the same table, except that rules after
+    a "fill_zero" rule see its filled values.
+    """
+    for rule in rules:
+        if rule.action not in ACTIONS:
+            raise ValueError("rule %s has unknown action %r" % (rule.name, rule.action))
+
+    table = prepared.table
+    lengths = prepared.ends - prepared.starts
+    report = pd.DataFrame({"n_obs": lengths}, index=pd.Index(prepared.ids, name=COL))
+
+    drop_rows = np.zeros(len(table), dtype=bool)
+    excluded = np.isin(prepared.ids, np.asarray(list(exclude_wells), dtype=prepared.ids.dtype))
+    drop_wells = excluded.copy()
+    flagged = np.zeros(len(prepared), dtype=bool)
+    reasons = [[] for _ in range(len(prepared))]
+    for i in np.flatnonzero(excluded):
+        reasons[i].append("exclude_wells")
+
+    for rule in rules:
+        failed = rule.mask(table)
+        counts = _per_well(failed, prepared)
+        report[rule.name] = counts
+        hit = counts > 0
+        if rule.action == "drop":
+            drop_rows |= failed
+        elif rule.action == "drop_well":
+            drop_wells |= hit
+        else:
+            flagged |= hit
+        if rule.action == "fill_zero" and failed.any():
+            numeric = table.select_dtypes("number").columns
+            table = table.copy()
+            table.loc[failed, numeric] = table.loc[failed, numeric].fillna(0)
+        for i in np.flatnonzero(hit):
+            reasons[i].append(rule.name)
+
+    keep = ~drop_rows & ~np.repeat(drop_wells, lengths)
+    n_kept = _per_well(keep, prepared)
+    empty = ~drop_wells & (n_kept < min_obs)
+    keep &= ~np.repeat(empty, lengths)
+
+    report["n_kept"] = np.where(drop_wells | empty, 0, n_kept)
+    report["status"] = np.select([excluded, drop_wells, empty, flagged],
+                                 ["excluded", "rejected", "empty", "flagged"], "ok")
+    report["reasons"] = [";".join(names) for names in reasons]
+    good = PreparedWells(table[keep].reset_index(drop=True))
+    return good, report
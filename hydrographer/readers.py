@@ -0,0 +1,65 @@
+"""Readers for the GWSI tables (excel workbooks, Data_Tables .txt files or the GWSI_ZIP_*.zip itself).
+
+``read_levels`` / ``read_sites`` read a source file directly.  ``load_levels``
+/ ``load_sites`` go through the columnar cache in ``hydrographer.cache``, so
+only the first run pays for ``pd.read_excel`` on the statewide workbooks.
+Every reader returns the compact column types of ``hydrographer.schema``.
+"""
+import os
+
+import pandas as pd
+
+from .cache import cached_read
+from .gwsi_zip import read_zip_levels, read_zip_sites
+from .prepare import COL_NAMES, COL_START
+from .schema import apply_levels_schema, apply_sites_schema
+
+##SITE COLUMNS THE GRAPHER ACTUALLY USES. EVERYTHING ELSE IN GWSI_SITES IS DROPPED AT READ TIME
+SITE_READ_COLUMNS = [COL_START, "SITE_WELL_ALTITUDE", "SITE_WELL_DEPTH", "SITE_WELL_REG_ID"]
+
+
+def _is_excel(filename):
+    return os.path.splitext(filename)[1].lower() in (".xlsx", ".xls", ".xlsm")
+
+
+def _is_zip(filename):
+    return os.path.splitext(filename)[1].lower() == ".zip"
+
+
+def read_levels(filename):
+    """Read GWSI_WW_LEVELS (.xlsx, .txt or a GWSI_ZIP .zip) with the GWSI Protocol column names."""
+    if _is_zip(filename):
+        return read_zip_levels(filename)
+    if _is_excel(filename):
+        df = pd.read_excel(filename, names=COL_NAMES, index_col=None)
+    else:
+        df = pd.read_csv(filename, names=COL_NAMES, header=0, index_col=False, parse_dates=["Date"])
+    return apply_levels_schema(df)
+
+
+def read_sites(filename, columns=SITE_READ_COLUMNS):
+    """Read GWSI_SITES (.xlsx, .txt or a GWSI_ZIP .zip), keeping only ``columns`` (None keeps all)."""
+    if _is_zip(filename):
+        return read_zip_sites(filename, columns)
+    usecols = None if columns is None else (lambda name: name in columns)
+    if _is_excel(filename):
+        df = pd.read_excel(filename, usecols=usecols, index_col=None)
+    else:
+        df = pd.read_csv(filename, usecols=usecols, index_col=False)
+    return apply_sites_schema(df)
+
+
+def load_levels(filename, cache_dir=None, use_cache=True):
+    """Read GWSI_WW_LEVELS through the columnar cache."""
+    if not use_cache:
+        return read_levels(filename)
+    ##ALSO CONVERTS CACHE FILES WRITTEN BEFORE THE SCHEMA EXISTED (A NO-OP FOR NEWER ONES)
+    return apply_levels_schema(cached_read(filename, read_levels, "levels", cache_dir=cache_dir))
+
+
+def load_sites(filename, columns=SITE_READ_COLUMNS, cache_dir=None, use_cache=True):
+    """Read GWSI_SITES through the columnar cache."""
+    if not use_cache:
+        return read_sites(filename, columns)
+    return apply_sites_schema(cached_read(filename, lambda name: read_sites(name, columns), "sites",
+                                          columns=columns, cache_dir=cache_dir))
@@ -0,0 +1,299 @@
+"""Hydrograph rendering, in this process or across a pool of worker processes.
+
+The v2.x scripts draw one matplotlib figure at a time at dpi=400, so a
+statewide run uses one core.  ``render_wells`` cleans the prepared table in
+one pass (``hydrographer.derive``), cuts the wells into small batches and
+hands them to worker processes.  Each worker gets only its wells' arrays
+(dates, depth to water, water level elevation and the title values), never
+the joined DataFrame, and draws on a headless Agg canvas without pyplot.
+
+Output names are the same as v2.6, ``Hydrographs_GWSI_Manual__<id>.png``,
+whatever the worker count; wells drawn with a transducer overlay are named
+``Hydrographs_GWSI_<id>__Transducer.png``, as in v2.2 - v2.5.  Each process draws on one reused
+``HydrographFigure`` (see ``hydrographer.figure``).  An output profile
+(``hydrographer.profiles``) sets the DPI, format and layout for a run.
+With ``encode_threads`` the PNGs are compressed and written on background
+threads while the next well is drawn (``hydrographer.encode``), and
+transducer series can be overlaid (``hydrographer.transducer``).
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .derive import derive, is_derived
+from .metadata import well_metadata
+from .prepare import COL
+from .profiles import get_profile
+from .timing import SPLIT_SAMPLES, maybe_stage
+from .transducer import overlay_arrays, plot_columns, widen_limits
+
+OUT_PREFIX = "Hydrographs_GWSI_Manual__"
+TRANSDUCER_NAME = "Hydrographs_GWSI_%s__Transducer.%s"
+DPI = 400
+BATCH_SIZE = 16
+
+
+def outname(location, outdir=".", ext="png", transducer=False):
+    """Return the output path for ``location`` (a PNG unless ``ext`` says otherwise).
+
+    ``transducer`` gives the name of a hydrograph with the transducer overlay.
+    """
+    if transducer:
+        return os.path.join(outdir, TRANSDUCER_NAME % (location, ext))
+    return os.path.join(outdir, "%s%s.%s" % (OUT_PREFIX, location, ext))
+
+
+def _outname(arrays, outdir, ext="png"):
+    """Return the output path for one well's payload, by whether it carries transducer readings."""
+    return outname(arrays[COL], outdir, ext, len(arrays.get("transducer_DTW", ())) > 0)
+
+
+##COLUMNS SENT TO THE WORKERS: PER-ROW ARRAYS, AND PER-WELL VALUES FROM THE METADATA TABLE
+ROW_COLUMNS = ["Date", "DEPTH_TO_WATER", "WLE_Calc"]
+WELL_COLUMNS = ["xmin", "xmax", "x_ticks", "title"]
+
+
+def iter_payloads(ready, skip=None, meta=None, positions=None, transducer=None, buckets=None):
+    """Yield the plotting arrays of every well in ``ready`` (the output of ``derive``).
+
+    Each well's arrays are views into the table's columns and its limits,
+    tick interval and title come from ``meta`` (``well_metadata(ready)`` if
+    not given); nothing is computed per well.  Wells for which
+    ``skip(location)`` is true are passed over.  ``positions`` limits the
+    wells to those row numbers of ``ready.ids``, in the order given.
+
+    With ``transducer`` (``transducer.prepare_transducer``) each well's
+    transducer depths are added, downsampled to ``buckets`` pixel columns
+    of its x axis (``meta`` should come from ``transducer.widen_limits``).
+    """
+    table = ready.table
+    if meta is None:
+        meta = well_metadata(ready)
+    rows = {name: table[name].to_numpy() for name in ROW_COLUMNS}
+    wells = {name: meta[name].to_numpy() for name in WELL_COLUMNS}
+    if positions is None:
+        positions = range(len(ready))
+    for i in positions:
+        location, start, end = ready.ids[i].item(), ready.starts[i], ready.ends[i]
+        if skip is not None and skip(location):
+            continue
+        arrays = {COL: location}
+        for name, values in rows.items():
+            arrays[name] = values[start:end]
+        for name, values in wells.items():
+            arrays[name] = values[i]
+        if transducer is not None:
+            arrays.update(overlay_arrays(transducer, location, buckets, (arrays["xmin"], arrays["xmax"])))
+        yield arrays
+
+
+def plot_hydrograph(arrays, filename, dpi=DPI):
+    """Draw and save one hydrograph on a throw-away figure (use render_wells for many wells)."""
+    from .figure import HydrographFigure
+
+    figure = HydrographFigure(dpi)
+    try:
+        figure.render(arrays, filename)
+    finally:
+        figure.close()
+
+
+##ONE FIGURE PER PROCESS, BUILT ON FIRST USE AND REUSED FOR EVERY WELL THE PROCESS DRAWS
+_FIGURES = {}
+
+
+def _figure(dpi, tight=True):
+    if (dpi, tight) not in _FIGURES:
+        from .figure import HydrographFigure
+        _FIGURES[dpi, tight] = HydrographFigure(dpi, tight)
+    return _FIGURES[dpi, tight]
+
+
+_WRITERS = {}
+
+
+def _writer(threads, compress_level):
+    if (threads, compress_level) not in _WRITERS:
+        from .encode import PngWriter
+        _WRITERS[threads, compress_level] = PngWriter(threads, compress_level)
+    return _WRITERS[threads, compress_level]
+
+
+def _encode_batch(batch, outdir, dpi, tight, encode):
+    """``_render_batch`` drawing to RGBA arrays and encoding them on a PngWriter's threads."""
+    figure = _figure(dpi, tight)
+    writer = _writer(*encode)
+    queued = []
+    for arrays in batch:
+        filename = _outname(arrays, outdir)
+        ##ONE BAD WELL SHOULD NOT STOP A 10 HOUR RUN, RECORD IT AND CARRY ON
+        try:
+            rgba = figure.draw(arrays)
+            queued.append((arrays[COL], filename, figure.last_split[:3], writer.submit(rgba, filename, dpi)))
+        except Exception as err:
+            queued.append((arrays[COL], filename, 0.0, err))
+    ##THE BATCH IS ONLY RETURNED ONCE ITS FILES ARE ON DISK, SO THE MANIFEST NEVER RECORDS A MISSING FILE
+    done = []
+    splits = []
+    for location, filename, split, future in queued:
+        if isinstance(future, Exception):
+            done.append((location, filename, 0.0, "error: %s" % future))
+            continue
+        try:
+            savefig = future.result()
+        except Exception as err:
+            done.append((location, filename, 0.0, "error: %s" % err))
+            continue
+        done.append((location, filename, sum(split) + savefig, "done"))
+        splits.append(split + (savefig,))
+    return done, splits
+
+
+def _render_batch(batch, outdir, dpi, ext="png", tight=True, encode=None):
+    if encode is not None and ext == "png":
+        return _encode_batch(batch, outdir, dpi, tight, encode)
+    figure = _figure(dpi, tight)
+    done = []
+    splits = []
+    for arrays in batch:
+        filename = _outname(arrays, outdir, ext)
+        ##ONE BAD WELL SHOULD NOT STOP A 10 HOUR RUN, RECORD IT AND CARRY ON
+        try:
+            seconds = figure.render(arrays, filename)
+            status = "done"
+            splits.append(figure.last_split)
+        except Exception as err:
+            seconds = 0.0
+            status = "error: %s" % err
+        done.append((arrays[COL], filename, seconds, status))
+    return done, splits
+
+
+def _timed(payloads, timer):
+    """Pass ``payloads`` through, adding the time to build each one to the "slice" samples."""
+    payloads = iter(payloads)
+    while True:
+        t0 = time.perf_counter()
+        arrays = next(payloads, None)
+        if arrays is None:
+            return
+        timer.add("slice", time.perf_counter() - t0)
+        yield arrays
+
+
+def _batches(payloads, size):
+    batch = []
+    for arrays in payloads:
+        batch.append(arrays)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def render_wells(prepared, outdir=".", workers=1, dpi=DPI, batch_size=BATCH_SIZE, bad_wells=None,
+                 manifest=None, timer=None, profile=None, encode_threads=0, compress_level=None,
+                 transducer=None):
+    """Render a hydrograph for every well in ``prepared``.
+
+    Returns ``[(location, filename, seconds, status), ...]`` for the wells
+    drawn in this call.  ``workers`` > 1 renders in that many processes; at
+    most two batches per worker are in flight, so the parent never slices
+    far ahead of the pool.  ``prepared`` goes through ``derive`` first unless
+    it already has been; wells left with no rows are appended to
+    ``bad_wells``.
+
+    With a ``Manifest``, every finished well is recorded as soon as its batch
+    comes back, and wells the manifest already has as current - same data,
+    same profile, dpi and layout - are skipped.
+
+    With a ``RunTimer`` (``hydrographer.timing``) the clean stage and each
+    well's slice seconds and plot, tight, draw and savefig split
+    (``timing.SPLIT_SAMPLES``) are recorded in it.
+
+    ``profile`` (a name in ``profiles.PROFILES`` or an OutputProfile)
+    replaces ``dpi`` and also sets the file format and layout.
+
+    ``encode_threads`` > 0 draws each PNG to an array and compresses and
+    writes it on that many threads per process (``encode.PngWriter``, zlib
+    level ``compress_level``, 6 if not given) while the next well is drawn.
+    "savefig" is then the encode and write on the pool.  SVG and PDF output
+    is always saved directly.
+
+    ``transducer`` (PreparedWells from ``transducer.prepare_transducer``)
+    overlays each well's transducer depths, reduced to at most four points
+    per pixel column, on its manual measurements; the x limits cover both.
+    Those wells are written as ``Hydrographs_GWSI_<id>__Transducer.png`` and
+    their readings are part of the manifest fingerprint.
+    """
+    os.makedirs(outdir, exist_ok=True)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    ext, tight = "png", True
+    if profile is not None:
+        profile = get_profile(profile)
+        dpi, ext, tight = profile.dpi, profile.format, profile.tight
+    encode = None
+    if encode_threads and ext == "png":
+        from .encode import COMPRESS_LEVEL
+        encode = (encode_threads, COMPRESS_LEVEL if compress_level is None else compress_level)
+
+    skip = None
+    if manifest is not None:
+        from .manifest import combine_fingerprints, snapshot_fingerprints
+        ##THE SAME DATA DRAWN WITH ANOTHER PROFILE IS A DIFFERENT OUTPUT
+        salt = "%s %s %d %s" % (profile.name if profile is not None else "", ext, dpi, tight)
+        hashes = combine_fingerprints(snapshot_fingerprints(prepared, transducer), salt=salt).to_dict()
+
+        def skip(location):
+            overlay = transducer is not None and location in transducer
+            return manifest.is_current(location, hashes[location], outname(location, outdir, ext, overlay))
+
+    if is_derived(prepared):
+        ready, empty = prepared, []
+    else:
+        with maybe_stage(timer, "clean"):
+            ready, empty = derive(prepared)
+        empty = empty.tolist()
+    if bad_wells is not None:
+        bad_wells.extend(empty)
+    if manifest is not None:
+        for location in empty:
+            if not skip(location):
+                manifest.record(location, hashes[location], "", "empty", 0.0)
+
+    done = []
+
+    def finish(returned):
+        results, splits = returned
+        if timer is not None and splits:
+            for name, seconds in zip(SPLIT_SAMPLES, zip(*splits)):
+                timer.extend(name, seconds)
+        if manifest is not None:
+            for location, filename, seconds, status in results:
+                manifest.record(location, hashes[location], filename, status, seconds)
+        done.extend(results)
+
+    meta = buckets = None
+    if transducer is not None:
+        meta = widen_limits(well_metadata(ready), transducer)
+        buckets = plot_columns(dpi, tight)
+    payloads = iter_payloads(ready, skip, meta, transducer=transducer, buckets=buckets)
+    if timer is not None:
+        payloads = _timed(payloads, timer)
+    batches = _batches(payloads, batch_size)
+    if workers <= 1:
+        for batch in batches:
+            finish(_render_batch(batch, outdir, dpi, ext, tight, encode))
+        return done
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        for batch in batches:
+            pending.append(pool.submit(_render_batch, batch, outdir, dpi, ext, tight, encode))
+            if len(pending) >= 2 * workers:
+                finish(pending.pop(0).result())
+        for future in pending:
+            finish(future.result())
+    return done
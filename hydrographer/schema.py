@@ -0,0 +1,112 @@
+"""Compact column types for the GWSI tables, applied by every loader.
+
+``pd.read_excel(filename1, names=ColNames)`` leaves the statewide levels
+table with int64 ids, float64 depths and the SOURCE_CODE / METHOD_CODE /
+REMARK_CODE columns as Python strings - tens of bytes per code per row,
+copied again into every worker process.  The schema here is applied at
+load time by ``readers`` and ``gwsi_zip``:
+
+   WELL_SITE_ID, SITE_WELL_SITE_ID   int64 (15 digits do not fit int32);
+                                     rows without a key cannot join and are dropped
+   ID                                int32 when every value fits, else int64
+   Date                              datetime64[ns]
+   depths, elevations, altitude      float32 (7 significant digits, 0.001 ft
+                                     at 7,000 ft, far finer than the 0.01 ft
+                                     measurements)
+   code columns                      category
+   SITE_WELL_REG_ID                  float32 (blank registrations stay NaN)
+
+Columns not in the schema are left alone.  Derived columns (``derive``)
+keep the float32 of their inputs.  ``memory_report`` shows the footprint
+per column before and after.
+"""
+import numpy as np
+import pandas as pd
+
+from .prepare import COL, COL_START
+
+LEVELS_SCHEMA = {
+    COL: "key",
+    "ID": "int",
+    "Date": "datetime64[ns]",
+    "DEPTH_TO_WATER": "float32",
+    "WATER_LEVEL_ELEVATION": "float32",
+    "SOURCE_CODE": "category",
+    "METHOD_CODE": "category",
+    "REMARK_CODE": "category",
+}
+SITES_SCHEMA = {
+    COL_START: "key",
+    COL: "key",
+    "SITE_WELL_ALTITUDE": "float32",
+    "SITE_WELL_DEPTH": "float32",
+    "SITE_WELL_REG_ID": "float32",
+}
+
+
+def _smallest_int(values):
+    values = pd.to_numeric(values)
+    if values.isna().any():
+        return values
+    info = np.iinfo(np.int32)
+    if len(values) and (values.min() < info.min or values.max() > info.max):
+        return values.astype(np.int64)
+    return values.astype(np.int32)
+
+
+def _category(values):
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values
+    ##CODES READ FROM EXCEL CAN BE NUMBERS OR BLANK; KEEP THEM AS TEXT, LIKE THE .txt TABLES
+    values = values.where(values.isna(), values.astype(str))
+    return values.astype("category")
+
+
+def apply_schema(df, schema):
+    """Return ``df`` with the columns in ``schema`` converted (see module docstring)."""
+    df = df.copy(deep=False)
+    for name, kind in schema.items():
+        if name not in df.columns:
+            continue
+        values = df[name]
+        if kind == "key":
+            if values.dtype != np.int64:
+                values = pd.to_numeric(values, errors="coerce")
+                if values.isna().any():
+                    df = df[values.notna()]
+                    values = values[values.notna()]
+                values = values.astype(np.int64)
+        elif kind == "int":
+            values = _smallest_int(values)
+        elif kind == "category":
+            values = _category(values)
+        elif kind.startswith("datetime64"):
+            values = pd.to_datetime(values).astype(kind)
+        else:
+            values = pd.to_numeric(values, errors="coerce").astype(kind)
+        df[name] = values
+    return df.reset_index(drop=True)
+
+
+def apply_levels_schema(df):
+    """``apply_schema`` with LEVELS_SCHEMA."""
+    return apply_schema(df, LEVELS_SCHEMA)
+
+
+def apply_sites_schema(df):
+    """``apply_schema`` with SITES_SCHEMA."""
+    return apply_schema(df, SITES_SCHEMA)
+
+
+def memory_report(before, after=None):
+    """Return bytes per column (``deep`` memory use) of ``before`` and, if given, ``after``, in MB."""
+    report = pd.DataFrame({"dtype": before.dtypes.astype(str),
+                           "mb": before.memory_usage(index=False, deep=True) / 2**20})
+    if after is not None:
+        report["dtype_after"] = after.dtypes.astype(str)
+        report["mb_after"] = after.memory_usage(index=False, deep=True) / 2**20
+        report["saved"] = 1 - report["mb_after"] / report["mb"]
+    report.loc["total"] = report.sum(numeric_only=True)
+    if after is not None:
+        report.loc["total", "saved"] = 1 - report.loc["total", "mb_after"] / report.loc["total", "mb"]
+    return report
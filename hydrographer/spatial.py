@@ -0,0 +1,153 @@
+"""Spatial well selection for AMA / model-domain subsets.
+
+Well subsets have been built by hand: ``subset1``/``subset2`` ID lists in
+v2.2, and in v2.5 a Tucson AMA DBF read with simpledbf or CSVs such as
+``GWSI_WLE_ZipExtract__TucsonAMA_4557wells.csv``.  ``WellLocator`` is a
+grid (bucket) index over the GWSI site coordinates that answers
+
+   bbox(west, south, east, north)
+   radius(lon, lat, miles)
+   polygon([(lon, lat), ...])
+
+in milliseconds and returns WELL_SITE_IDs that go straight into
+``PreparedWells.subset``, ``render_wells`` and the exporters.
+
+Coordinates are decimal degrees (NAD83, west longitudes negative).  When
+GWSI_SITES has no latitude/longitude columns they are decoded from the
+WELL_SITE_ID itself: GWSI site ids are DDMMSS latitude + DDDMMSS longitude
++ a 2 digit sequence number (314015111033401 -> 31 40'15"N, 111 03'34"W).
+"""
+import numpy as np
+import pandas as pd
+
+from .prepare import COL, COL_START
+
+CELL_DEGREES = 0.1
+EARTH_RADIUS_MILES = 3958.8
+LAT_COLUMNS = ["SITE_LATITUDE_DECIMAL", "LATITUDE_DECIMAL", "LATITUDE", "LAT"]
+LON_COLUMNS = ["SITE_LONGITUDE_DECIMAL", "LONGITUDE_DECIMAL", "LONGITUDE", "LON"]
+
+
+def coordinates_from_site_id(ids):
+    """Decode (lon, lat) decimal degrees from 15-digit GWSI site ids."""
+    ids = np.asarray(ids, dtype=np.int64)
+    lat_dms = ids // 10**9
+    lon_dms = (ids // 100) % 10**7
+    lat = lat_dms // 10**4 + (lat_dms // 100 % 100) / 60 + (lat_dms % 100) / 3600
+    lon = lon_dms // 10**4 + (lon_dms // 100 % 100) / 60 + (lon_dms % 100) / 3600
+    return -lon.astype(float), lat.astype(float)
+
+
+def _first_column(df, names):
+    for name in names:
+        if name in df.columns:
+            return df[name].to_numpy(dtype=float)
+    return None
+
+
+class WellLocator:
+    """Grid index of well locations; ``cell`` is the bucket size in degrees."""
+
+    def __init__(self, ids, lon, lat, cell=CELL_DEGREES):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.lon = np.asarray(lon, dtype=float)
+        self.lat = np.asarray(lat, dtype=float)
+        self.cell = cell
+
+        ##SORT THE WELLS BY GRID CELL; EACH CELL IS THEN ONE CONTIGUOUS RUN
+        good = np.isfinite(self.lon) & np.isfinite(self.lat)
+        self.ids, self.lon, self.lat = self.ids[good], self.lon[good], self.lat[good]
+        self._col0 = np.floor(self.lon.min() / cell) if len(self.ids) else 0.0
+        self._row0 = np.floor(self.lat.min() / cell) if len(self.ids) else 0.0
+        cols = (np.floor(self.lon / cell) - self._col0).astype(np.int64)
+        rows = (np.floor(self.lat / cell) - self._row0).astype(np.int64)
+        self._ncols = int(cols.max()) + 1 if len(cols) else 1
+        self._nrows = int(rows.max()) + 1 if len(rows) else 1
+        keys = rows * self._ncols + cols
+        order = np.argsort(keys, kind="stable")
+        self.ids, self.lon, self.lat, keys = self.ids[order], self.lon[order], self.lat[order], keys[order]
+        self._cell_start = np.searchsorted(keys, np.arange(self._nrows * self._ncols), side="left")
+        self._cell_end = np.searchsorted(keys, np.arange(self._nrows * self._ncols), side="right")
+
+    @classmethod
+    def from_sites(cls, df2, cell=CELL_DEGREES):
+        """Build from GWSI_SITES (lat/lon columns if present, else decoded site ids)."""
+        df2 = df2.rename(columns={COL_START: COL})
+        ids = df2[COL].to_numpy()
+        lon = _first_column(df2, LON_COLUMNS)
+        lat = _first_column(df2, LAT_COLUMNS)
+        if lon is None or lat is None:
+            lon, lat = coordinates_from_site_id(ids)
+        return cls(ids, lon, lat, cell)
+
+    @classmethod
+    def from_ids(cls, ids, cell=CELL_DEGREES):
+        """Build from WELL_SITE_IDs alone, decoding their coordinates."""
+        lon, lat = coordinates_from_site_id(ids)
+        return cls(ids, lon, lat, cell)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _candidates(self, west, south, east, north):
+        """Row numbers of wells in the grid cells touching the box (a superset of the answer)."""
+        c0 = max(int(np.floor(west / self.cell) - self._col0), 0)
+        c1 = min(int(np.floor(east / self.cell) - self._col0), self._ncols - 1)
+        r0 = max(int(np.floor(south / self.cell) - self._row0), 0)
+        r1 = min(int(np.floor(north / self.cell) - self._row0), self._nrows - 1)
+        if c0 > c1 or r0 > r1:
+            return np.zeros(0, dtype=np.int64)
+        ##CELLS OF ONE GRID ROW ARE CONSECUTIVE, SO EACH ROW IS ONE SLICE
+        first = np.arange(r0, r1 + 1) * self._ncols
+        starts = self._cell_start[first + c0]
+        ends = self._cell_end[first + c1]
+        lengths = ends - starts
+        if lengths.sum() == 0:
+            return np.zeros(0, dtype=np.int64)
+        offsets = np.cumsum(lengths) - lengths
+        return np.arange(lengths.sum()) + np.repeat(starts - offsets, lengths)
+
+    def bbox(self, west, south, east, north):
+        """WELL_SITE_IDs inside a longitude/latitude box."""
+        rows = self._candidates(west, south, east, north)
+        lon, lat = self.lon[rows], self.lat[rows]
+        inside = (lon >= west) & (lon <= east) & (lat >= south) & (lat <= north)
+        return np.sort(self.ids[rows[inside]])
+
+    def radius(self, lon, lat, miles):
+        """WELL_SITE_IDs within ``miles`` (great-circle) of a point."""
+        dlat = np.degrees(miles / EARTH_RADIUS_MILES)
+        dlon = dlat / max(np.cos(np.radians(min(abs(lat) + dlat, 89.9))), 1e-6)
+        rows = self._candidates(lon - dlon, lat - dlat, lon + dlon, lat + dlat)
+        lat1, lon1 = np.radians(lat), np.radians(lon)
+        lat2, lon2 = np.radians(self.lat[rows]), np.radians(self.lon[rows])
+        a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+        distance = 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(a))
+        return np.sort(self.ids[rows[distance <= miles]])
+
+    def polygon(self, vertices):
+        """WELL_SITE_IDs inside a polygon given as [(lon, lat), ...] (even-odd rule)."""
+        vertices = np.asarray(vertices, dtype=float)
+        px, py = vertices[:, 0], vertices[:, 1]
+        rows = self._candidates(px.min(), py.min(), px.max(), py.max())
+        x, y = self.lon[rows], self.lat[rows]
+        inside = np.zeros(len(rows), dtype=bool)
+        ##RAY CASTING, ONE POLYGON EDGE AT A TIME OVER ALL CANDIDATE WELLS
+        for i in range(len(vertices)):
+            x1, y1 = px[i - 1], py[i - 1]
+            x2, y2 = px[i], py[i]
+            crosses = (y1 > y) != (y2 > y)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                at = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+            inside ^= crosses & (x < at)
+        return np.sort(self.ids[rows[inside]])
+
+
+def read_polygon(filename):
+    """Read polygon vertices from a CSV with lon/lat (or x/y) columns, in ring order."""
+    df = pd.read_csv(filename)
+    lower = {name.lower(): name for name in df.columns}
+    for xname, yname in (("lon", "lat"), ("longitude", "latitude"), ("x", "y")):
+        if xname in lower and yname in lower:
+            return df[[lower[xname], lower[yname]]].to_numpy(dtype=float)
+    return df.iloc[:, :2].to_numpy(dtype=float)
@@ -0,0 +1,129 @@
+"""Statewide per-well summary statistics in one vectorized pass.
+
+The only per-well numbers the v2.x scripts produce are implicit - the
+minimum WATER_LEVEL_ELEVATION behind ``Rise``, ``total_years_float`` and the
+row count that marks a bad well.  Model calibration needs a summary of every
+well, and computing one per well in the plotting loop would cost the same
+pandas overhead thousands of times.  ``well_stats`` works on the ready
+(``derive``-d) table, where each well's rows are contiguous and in date
+order, so every statistic is a segmented reduction (``ufunc.reduceat`` over
+the well offsets) or a ``bincount`` - no groupby, no per-well Python:
+
+   n_obs, first_date, last_date, period_years   record length (as metadata.py)
+   first_dtw, last_dtw                          DEPTH_TO_WATER at both ends
+   min_wle, max_wle                             range of WLE_Calc
+   max_rise                                     largest Rise (WATER_LEVEL_ELEVATION
+                                                above the well's minimum)
+   decline_ft_per_yr                            least-squares slope of WLE_Calc
+                                                against time, sign flipped so a
+                                                falling water level is positive
+   seasonal_amplitude_ft                        peak-to-trough of the calendar-month
+                                                means of the detrended WLE_Calc
+   max_gap_years, n_gaps                        longest time between measurements,
+                                                and how many exceed ``gap_years``
+
+Statistics that need more data than a well has (a slope from one
+measurement, a seasonal cycle from fewer than MIN_MONTHS months) are NaN.
+"""
+import numpy as np
+import pandas as pd
+
+from .metadata import DAYS_PER_YEAR, well_metadata
+from .prepare import COL
+
+GAP_YEARS = 2.0
+MIN_MONTHS = 4
+##THE FITTED STATISTICS ARE FLOAT64; FOUR DECIMALS IS WELL BELOW THE 0.01 FT OF THE MEASUREMENTS
+DECIMALS = 4
+
+STATS_COLUMNS = ["n_obs", "first_date", "last_date", "period_years", "first_dtw", "last_dtw",
+                 "min_wle", "max_wle", "max_rise", "decline_ft_per_yr", "seasonal_amplitude_ft",
+                 "max_gap_years", "n_gaps", "SITE_WELL_REG_ID", "SITE_WELL_DEPTH"]
+
+
+def linear_trend(x, y, starts, lengths):
+    """Return each well's least-squares slope of ``y`` on ``x`` and the per-row fitted values.
+
+    Sums are taken on ``x`` centred per well, which keeps the float64
+    sums well conditioned for century-long records.  Wells with one
+    measurement (or all on one day) get a NaN slope and fitted values equal
+    to their mean.
+    """
+    n = lengths.astype(float)
+    x_mean = np.add.reduceat(x, starts) / n
+    y_mean = np.add.reduceat(y, starts) / n
+    dx = x - np.repeat(x_mean, lengths)
+    sxx = np.add.reduceat(dx * dx, starts)
+    sxy = np.add.reduceat(dx * y, starts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        slope = np.where(sxx > 0, sxy / sxx, np.nan)
+    fitted = np.repeat(y_mean, lengths) + dx * np.repeat(np.nan_to_num(slope), lengths)
+    return slope, fitted
+
+
+def seasonal_amplitude(residual, months, rows_well, n_wells, min_months=MIN_MONTHS):
+    """Return each well's peak-to-trough of the monthly means of ``residual`` (NaN with too few months)."""
+    cell = rows_well * 12 + months
+    counts = np.bincount(cell, minlength=n_wells * 12).reshape(n_wells, 12)
+    sums = np.bincount(cell, weights=residual, minlength=n_wells * 12).reshape(n_wells, 12)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.where(counts > 0, sums / counts, np.nan)
+    seen = counts.astype(bool).sum(axis=1)
+    amplitude = np.full(n_wells, np.nan)
+    enough = seen >= min_months
+    amplitude[enough] = np.nanmax(means[enough], axis=1) - np.nanmin(means[enough], axis=1)
+    return amplitude
+
+
+def well_stats(ready, meta=None, gap_years=GAP_YEARS):
+    """Return the summary table (indexed by WELL_SITE_ID, STATS_COLUMNS) for every well in ``ready``."""
+    if meta is None:
+        meta = well_metadata(ready)
+    table = ready.table
+    starts, ends = ready.starts, ready.ends
+    lengths = ends - starts
+    n_wells = len(ready)
+
+    dates = table["Date"].to_numpy().astype("datetime64[ns]")
+    ##FIRST/LAST/MIN/MAX KEEP THE COLUMNS' OWN (float32) VALUES; THE FITS ARE DONE IN float64
+    dtw = table["DEPTH_TO_WATER"].to_numpy()
+    wle = table["WLE_Calc"].to_numpy()
+    rise = table["Rise"].to_numpy()
+    wle64 = wle.astype(float)
+
+    ##TIME IN YEARS SINCE EACH WELL'S FIRST MEASUREMENT
+    days = (dates - np.repeat(dates[starts], lengths)) / np.timedelta64(1, "D")
+    years = days / DAYS_PER_YEAR
+    slope, fitted = linear_trend(years, wle64, starts, lengths)
+
+    rows_well = np.repeat(np.arange(n_wells), lengths)
+    months = dates.astype("datetime64[M]").astype(np.int64) % 12
+    amplitude = seasonal_amplitude(wle64 - fitted, months, rows_well, n_wells)
+
+    ##TIME SINCE THE PREVIOUS MEASUREMENT OF THE SAME WELL (0 ON EACH WELL'S FIRST ROW)
+    gaps = np.diff(years, prepend=0.0)
+    gaps[starts] = 0.0
+    return pd.DataFrame({"n_obs": lengths,
+                         "first_date": meta["min_date"].to_numpy(),
+                         "last_date": meta["max_date"].to_numpy(),
+                         "period_years": meta["total_years_float"].to_numpy(),
+                         "first_dtw": dtw[starts],
+                         "last_dtw": dtw[ends - 1],
+                         "min_wle": np.fmin.reduceat(wle, starts),
+                         "max_wle": np.fmax.reduceat(wle, starts),
+                         "max_rise": np.fmax.reduceat(rise, starts),
+                         "decline_ft_per_yr": (-slope).round(DECIMALS),
+                         "seasonal_amplitude_ft": amplitude.round(DECIMALS),
+                         "max_gap_years": np.maximum.reduceat(gaps, starts).round(DECIMALS),
+                         "n_gaps": np.add.reduceat((gaps > gap_years).astype(np.int64), starts),
+                         "SITE_WELL_REG_ID": meta["SITE_WELL_REG_ID"].to_numpy(),
+                         "SITE_WELL_DEPTH": meta["SITE_WELL_DEPTH"].to_numpy()},
+                        index=pd.Index(ready.ids, name=COL))
+
+
+def write_stats(stats, path):
+    """Write the summary table to ``path`` (.parquet, otherwise CSV)."""
+    if str(path).lower().endswith(".parquet"):
+        stats.to_parquet(path)
+    else:
+        stats.to_csv(path)
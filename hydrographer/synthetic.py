@@ -0,0 +1,129 @@
+"""Synthetic GWSI_WW_LEVELS / GWSI_SITES tables for benchmarks.
+
+Performance work on the grapher needs the statewide ADWR download, which is
+large, changes with every release and cannot be shared with every test
+machine.  ``synthetic_gwsi`` builds tables with the same columns and the
+shapes that matter for speed:
+
+   WELL_SITE_ID    15-digit ints in the GWSI DDMMSS/DDDMMSS/NN form, inside
+                   Arizona, so ``spatial.WellLocator`` can decode them
+   observations    per-well counts skewed like GWSI (lognormal, most wells a
+                   handful of readings, a few with thousands)
+   Date            each well's record somewhere between 1940 and 2020
+   levels          a declining trend, a seasonal swing and noise; NaN and 0
+                   depths ("zero errors") and a few WLEs that disagree with
+                   SITE_WELL_ALTITUDE - DEPTH_TO_WATER
+   sites           altitude, depth, registration number (some blank), and a
+                   few observation wells missing from GWSI_SITES
+
+The same ``seed`` always gives the same tables.  ``SCALES`` names the sizes
+the benchmark suite runs at.
+"""
+import numpy as np
+import pandas as pd
+
+from .prepare import COL_NAMES, COL_START
+
+##NUMBER OF WELLS; "large" IS ABOUT THE SIZE OF THE STATEWIDE GWSI MANUAL LEVELS TABLE
+SCALES = {"small": 1_000, "medium": 10_000, "large": 40_000}
+START = "1940-01-01"
+END = "2020-04-14"      ##DATE OF THE GWSI_ZIP_04142020 DOWNLOAD, FIXED SO A SEED ALWAYS GIVES THE SAME TABLES
+MEDIAN_OBS = 12
+MAX_OBS = 5_000
+
+##ARIZONA IN DEGREES, MINUTES, SECONDS
+LAT_RANGE = (31.33, 37.0)
+LON_RANGE = (109.05, 114.8)
+
+
+def _dms(degrees):
+    """Encode decimal degrees as the integer DDMMSS / DDDMMSS used in GWSI site ids."""
+    total = np.round(degrees * 3600).astype(np.int64)
+    return total // 3600 * 10000 + total % 3600 // 60 * 100 + total % 60
+
+
+def synthetic_site_ids(n_wells, rng):
+    """Return ``n_wells`` unique, sorted GWSI-style WELL_SITE_IDs inside Arizona."""
+    ids = np.zeros(0, dtype=np.int64)
+    while len(ids) < n_wells:
+        n = n_wells - len(ids)
+        lat = _dms(rng.uniform(*LAT_RANGE, n))
+        lon = _dms(rng.uniform(*LON_RANGE, n))
+        seq = rng.integers(1, 4, n)
+        ids = np.unique(np.concatenate([ids, lat * 10**9 + lon * 100 + seq]))
+    return ids[:n_wells]
+
+
+def observation_counts(n_wells, rng, rows=None, median=MEDIAN_OBS, max_obs=MAX_OBS):
+    """Skewed per-well observation counts (1 .. ``max_obs``), scaled to about ``rows`` in total if given."""
+    counts = rng.lognormal(np.log(median), 1.3, n_wells)
+    if rows is not None:
+        counts *= rows / counts.sum()
+    return np.clip(np.round(counts), 1, max_obs).astype(np.int64)
+
+
+def synthetic_gwsi(n_wells, rows=None, seed=0, start=START, end=END, nan_rate=0.01, zero_rate=0.01,
+                   mismatch_rate=0.005, missing_sites=0.01):
+    """Return ``(levels, sites)`` shaped like GWSI_WW_LEVELS and GWSI_SITES (see module docstring).
+
+    ``levels`` has ``COL_NAMES`` columns in file order (not sorted by well);
+    ``sites`` has SITE_WELL_SITE_ID, SITE_WELL_ALTITUDE, SITE_WELL_DEPTH and
+    SITE_WELL_REG_ID.
+    """
+    rng = np.random.default_rng(seed)
+    ids = synthetic_site_ids(n_wells, rng)
+    counts = observation_counts(n_wells, rng, rows)
+    n = int(counts.sum())
+    well = np.repeat(np.arange(n_wells), counts)
+
+    ##EACH WELL'S RECORD: A START DATE AND A LENGTH, OBSERVATIONS SPREAD OVER IT IN DATE ORDER
+    first_day = np.datetime64(start, "D")
+    last_day = np.datetime64(end, "D")
+    days = int((last_day - first_day) / np.timedelta64(1, "D"))
+    record_start = rng.integers(0, days, n_wells)
+    record_days = np.minimum(days - record_start, rng.integers(1, days, n_wells))
+    where = np.sort(well + rng.random(n)) - well
+    offset = record_start[well] + (where * record_days[well]).astype(np.int64)
+    dates = (first_day + offset.astype("timedelta64[D]")).astype("datetime64[ns]")
+    years = offset / 365.25
+
+    ##WATER LEVELS: STARTING DEPTH, DECLINE IN FT/YR, SEASONAL SWING AND NOISE
+    altitude = rng.uniform(1000, 7000, n_wells)
+    well_depth = rng.uniform(100, 1500, n_wells)
+    base = rng.uniform(5, 0.6 * well_depth)
+    decline = rng.normal(1.0, 1.5, n_wells)
+    swing = rng.uniform(0, 15, n_wells)
+    season = np.sin(2 * np.pi * years + rng.uniform(0, 2 * np.pi, n_wells)[well])
+    elapsed = (offset - record_start[well]) / 365.25
+    dtw = np.clip(base[well] + decline[well] * elapsed + swing[well] * season
+                  + rng.normal(0, 2, n), 0.5, None).round(2)
+    wle = (altitude[well] - dtw).round(2)
+    mismatch = rng.random(n) < mismatch_rate
+    wle[mismatch] += rng.choice([-100.0, 100.0], mismatch.sum())
+    dtw[rng.random(n) < nan_rate] = np.nan
+    dtw[rng.random(n) < zero_rate] = 0.0
+
+    levels = pd.DataFrame({
+        "WELL_SITE_ID": ids[well],
+        "ID": np.arange(1, n + 1),
+        "Date": dates,
+        "DEPTH_TO_WATER": dtw,
+        "WATER_LEVEL_ELEVATION": wle,
+        "SOURCE_CODE": rng.choice(["A", "G", "O", "S"], n, p=[0.6, 0.2, 0.1, 0.1]),
+        "METHOD_CODE": rng.choice(["S", "T", "V", "E", "A"], n, p=[0.55, 0.2, 0.1, 0.1, 0.05]),
+        "REMARK_CODE": rng.choice(["", "P", "R", "D", "O"], n, p=[0.8, 0.08, 0.05, 0.04, 0.03]),
+    })[COL_NAMES]
+    ##THE DOWNLOAD IS NOT ORDERED BY WELL AND DATE
+    levels = levels.iloc[rng.permutation(n)].reset_index(drop=True)
+
+    reg_id = rng.integers(500000, 950000, n_wells).astype(float)
+    reg_id[rng.random(n_wells) < 0.05] = np.nan
+    has_site = rng.random(n_wells) >= missing_sites
+    sites = pd.DataFrame({COL_START: ids, "SITE_WELL_ALTITUDE": altitude.round(1),
+                          "SITE_WELL_DEPTH": well_depth.round(0), "SITE_WELL_REG_ID": reg_id})[has_site]
+    return levels, sites.reset_index(drop=True)
+
+
+def synthetic_scale(name, seed=0):
+    """``synthetic_gwsi`` at one of the named ``SCALES``."""
+    return synthetic_gwsi(SCALES[name], seed=seed)
@@ -0,0 +1,168 @@
+"""Per-stage timers and the run report.
+
+The script header still says "Approximate Run Time = X minutes XX.X sec" and
+v2.5 has a ``Time_Start``/``Time_End`` pair that no longer brackets anything,
+so nobody knows whether a statewide run is bound by reading, pandas or PNG
+encoding.  ``RunTimer`` collects two kinds of numbers:
+
+   stages    wall time of one-off steps (read, join, clean, write), recorded
+             with ``with timer.stage("read"):``
+   samples   one value per well for the hot path (slice, then the
+             ``SPLIT_SAMPLES`` of each figure), recorded with
+             ``timer.add("savefig", seconds)``, summarised as percentiles and
+             a histogram over ``HISTOGRAM_BINS``
+
+A well's figure time is split four ways, so a report shows whether a run is
+bound by drawing or by PNG encoding:
+
+   plot      replacing the line data, limits and title (no drawing)
+   tight     laying out the text to measure the tight bbox
+   draw      the Agg rasterization at the output DPI
+   savefig   PNG compression and the file write (all of savefig for SVG/PDF)
+
+With ``profile=True`` the whole run goes through cProfile (the stats are
+written next to the report as ``.prof``, for snakeviz or pstats), and with
+``trace_memory=True`` tracemalloc records the peak Python heap of every stage.
+Both slow the run down, so they are off by default.
+
+``report()`` returns a dict; ``write_report`` saves it as JSON, or as a CSV
+with one row per stage/sample when the path ends in ``.csv``.
+"""
+import cProfile
+import csv
+import json
+import os
+import platform
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import numpy as np
+
+##HISTOGRAM BIN EDGES FOR PER-WELL TIMES, IN SECONDS
+HISTOGRAM_BINS = [0, .001, .002, .005, .01, .02, .05, .1, .2, .5, 1, 2, 5, 10, float("inf")]
+SPLIT_SAMPLES = ("plot", "tight", "draw", "savefig")
+CSV_FIELDS = ["name", "kind", "count", "total", "mean", "p50", "p90", "p99", "max", "peak_mb"]
+
+
+class RunTimer:
+    """Collect stage times and per-well samples for one run (see module docstring)."""
+
+    def __init__(self, profile=False, trace_memory=False):
+        self.stages = {}
+        self.samples = {}
+        self.peaks = {}
+        self.trace_memory = trace_memory
+        self.profiler = cProfile.Profile() if profile else None
+        self.started = time.time()
+        self._t0 = time.perf_counter()
+        self.elapsed = None
+
+    def start(self):
+        """Start the optional profiler and memory tracing."""
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if self.profiler is not None:
+            self.profiler.enable()
+        return self
+
+    def stop(self):
+        """Stop the profiler and memory tracing and fix the total run time."""
+        if self.profiler is not None:
+            self.profiler.disable()
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.elapsed = time.perf_counter() - self._t0
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @contextmanager
+    def stage(self, name):
+        """Time the ``with`` block and add it to stage ``name``."""
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - t0
+            if tracing:
+                peak = tracemalloc.get_traced_memory()[1] / 2**20
+                self.peaks[name] = max(self.peaks.get(name, 0.0), peak)
+
+    def add(self, name, seconds):
+        """Record one per-well sample of ``name``."""
+        self.samples.setdefault(name, []).append(seconds)
+
+    def extend(self, name, seconds):
+        """Record many per-well samples of ``name`` at once."""
+        self.samples.setdefault(name, []).extend(seconds)
+
+    def summary(self, name):
+        """Return count, total, mean, percentiles, max and histogram of the samples of ``name``."""
+        values = np.asarray(self.samples.get(name, []), dtype=float)
+        if len(values) == 0:
+            return {"count": 0, "total": 0.0}
+        p50, p90, p99 = np.percentile(values, [50, 90, 99])
+        counts, _ = np.histogram(values, bins=HISTOGRAM_BINS)
+        return {"count": len(values), "total": float(values.sum()), "mean": float(values.mean()),
+                "p50": float(p50), "p90": float(p90), "p99": float(p99), "max": float(values.max()),
+                "histogram": {"edges": HISTOGRAM_BINS[:-1], "counts": counts.tolist()}}
+
+    def report(self, **extra):
+        """Return the run report as a dict; ``extra`` values (wells, dpi, ...) are included as given."""
+        elapsed = self.elapsed if self.elapsed is not None else time.perf_counter() - self._t0
+        stages = {name: {"total": seconds} for name, seconds in self.stages.items()}
+        for name, peak in self.peaks.items():
+            stages[name]["peak_mb"] = peak
+        return {"started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+                "elapsed": elapsed, "python": platform.python_version(), "machine": platform.node(),
+                "run": extra, "stages": stages,
+                "samples": {name: self.summary(name) for name in self.samples}}
+
+    def write_report(self, path, **extra):
+        """Write ``report(**extra)`` to ``path`` (.json or .csv) and the profile to ``<path>.prof``."""
+        report = self.report(**extra)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if path.lower().endswith(".csv"):
+            with open(path, "w", newline="") as fh:
+                writer = csv.DictWriter(fh, CSV_FIELDS, extrasaction="ignore")
+                writer.writeheader()
+                for name, values in report["stages"].items():
+                    writer.writerow(dict(values, name=name, kind="stage", count=1))
+                for name, values in report["samples"].items():
+                    writer.writerow(dict(values, name=name, kind="per_well"))
+                writer.writerow({"name": "run", "kind": "total", "count": 1, "total": report["elapsed"]})
+        else:
+            with open(path, "w") as fh:
+                json.dump(report, fh, indent=2, default=str)
+        if self.profiler is not None:
+            self.profiler.dump_stats(os.path.splitext(path)[0] + ".prof")
+        return report
+
+    def format(self):
+        """Return a short text table of the stages and per-well samples."""
+        lines = ["%-12s %10s" % ("stage", "seconds")]
+        for name, seconds in self.stages.items():
+            lines.append("%-12s %10.2f" % (name, seconds))
+        for name in self.samples:
+            s = self.summary(name)
+            if s["count"]:
+                lines.append("%-12s %10.2f  (%d wells, p50 %.3f s, p90 %.3f s, max %.3f s)"
+                             % (name, s["total"], s["count"], s["p50"], s["p90"], s["max"]))
+        return "\n".join(lines)
+
+
+@contextmanager
+def maybe_stage(timer, name):
+    """``timer.stage(name)``, or nothing when ``timer`` is None."""
+    if timer is None:
+        yield
+    else:
+        with timer.stage(name):
+            yield
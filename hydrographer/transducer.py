@@ -0,0 +1,120 @@
+"""Transducer series overlaid on the manual hydrographs, downsampled per pixel.
+
+The v2.2 - v2.6 scripts carry a commented-out GWSI_TRANSDUCER_LEVELS.txt
+reader and write ``Hydrographs_GWSI_<id>__Transducer.png``, but only ever
+plot the manual measurements.  A transducer logs every few minutes or hours,
+so one well can have millions of readings; drawing all of them would cost
+far more than the rest of the figure and put thousands of points on every
+pixel column.
+
+``downsample`` keeps, for each of ``buckets`` equal time slices of the x
+axis (``xmin`` - ``xmax``, one per pixel column of the plot), the first,
+last, lowest and highest reading, in time order.  The line drawn through
+those points reaches the same pixel rows in every column as the full series
+(the "M4" reduction), so the plot is visually lossless while a well costs at
+most 4 x ``buckets`` points - about 8,000 at 400 dpi, whatever the number of
+readings.  Only the antialiased edges of the 0.6 pt line differ, in about
+0.1% of the pixels; that is the same with buckets cut exactly on the
+output's pixel columns.
+
+   transducer = prepare_transducer(read_zip_transducer(zip_path, wells=ready.ids))
+   render_wells(ready, outdir, transducer=transducer)
+
+Only wells with manual measurements are drawn; their x limits are widened to
+whole years around the transducer record where it runs past the manual one.
+"""
+import numpy as np
+import pandas as pd
+
+from .metadata import DAYS_PER_YEAR, YEARS_FOR_2YR_TICKS
+from .prepare import COL, PreparedWells
+
+##WIDTH OF THE HYDROGRAPH AXES: matplotlib'S DEFAULT 6.4 IN FIGURE, 0.125 - 0.9 OF IT BETWEEN THE AXES,
+##OR 0.13 - 0.86 WITH THE FIXED MARGINS OF figure.FIXED_LAYOUT
+FIGURE_WIDTH = 6.4
+AXES_FRACTION = 0.775
+FIXED_AXES_FRACTION = 0.73
+
+
+def plot_columns(dpi, tight=True):
+    """Return the number of pixel columns across the hydrograph axes at ``dpi`` (``tight=False``: fixed margins)."""
+    return int(np.ceil(FIGURE_WIDTH * (AXES_FRACTION if tight else FIXED_AXES_FRACTION) * dpi))
+
+
+def prepare_transducer(df):
+    """Return the transducer table (from ``gwsi_zip.read_zip_transducer``) as PreparedWells.
+
+    Rows without a date or depth to water are dropped; the rest are sorted
+    by WELL_SITE_ID and Date.
+    """
+    df = df.dropna(subset=["Date", "DEPTH_TO_WATER"])
+    df = df.sort_values([COL, "Date"], kind="mergesort", ignore_index=True)
+    return PreparedWells(df)
+
+
+def minmax_indices(x, y, buckets, x0=None, x1=None):
+    """Return the sorted row numbers of the first, last, min and max ``y`` in each bucket.
+
+    ``x`` must be sorted; ``x0`` - ``x1`` (the axis limits, ``x``'s own range
+    if not given) is cut into ``buckets`` slices of equal width.
+    """
+    x0 = x[0] if x0 is None else x0
+    x1 = x[-1] if x1 is None else x1
+    if x1 <= x0:
+        return np.unique(np.r_[0, np.argmin(y), np.argmax(y), len(x) - 1])
+    bucket = np.clip(np.floor((x - x0) / (x1 - x0) * buckets), 0, buckets - 1).astype(np.int64)
+    first = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    last = np.r_[first[1:], len(x)] - 1
+    ##SORTED BY (BUCKET, y): EACH BUCKET'S FIRST ENTRY IS ITS MINIMUM, ITS LAST ENTRY ITS MAXIMUM
+    order = np.lexsort((y, bucket))
+    return np.unique(np.concatenate((first, last, order[first], order[last])))
+
+
+def downsample(x, y, buckets, x0=None, x1=None):
+    """Return ``(x, y)`` reduced to at most 4 points per bucket of ``x0`` - ``x1`` (unchanged if already that small)."""
+    if len(x) <= 4 * buckets:
+        return x, y
+    keep = minmax_indices(x, y, buckets, x0, x1)
+    return x[keep], y[keep]
+
+
+def widen_limits(meta, transducer):
+    """Return ``meta`` (``well_metadata``) with xmin/xmax/x_ticks also covering each well's transducer record."""
+    if not len(transducer):
+        return meta
+    dates = transducer.table["Date"].to_numpy()
+    first = pd.Series(dates[transducer.starts], index=transducer.ids).reindex(meta.index).to_numpy()
+    last = pd.Series(dates[transducer.ends - 1], index=transducer.ids).reindex(meta.index).to_numpy()
+    has = ~np.isnat(first)
+    first = np.where(has, np.minimum(first, meta["min_date"].to_numpy()), meta["min_date"].to_numpy())
+    last = np.where(has, np.maximum(last, meta["max_date"].to_numpy()), meta["max_date"].to_numpy())
+
+    ##SAME ROUNDING AND TICK RULE AS metadata.well_metadata, ON THE COMBINED RECORD
+    total_years_float = ((last - first) // np.timedelta64(1, "D")) / DAYS_PER_YEAR
+    meta = meta.copy()
+    meta["xmin"] = first.astype("datetime64[Y]").astype("datetime64[ns]")
+    meta["xmax"] = (last.astype("datetime64[Y]") + 1).astype("datetime64[ns]")
+    meta["x_ticks"] = np.where(total_years_float > YEARS_FOR_2YR_TICKS, 2, 1)
+    return meta
+
+
+def overlay_arrays(transducer, location, buckets, limits=None):
+    """Return ``{"transducer_Date", "transducer_DTW"}`` for one well, downsampled to ``buckets`` columns.
+
+    ``limits`` are the well's x axis ``(xmin, xmax)`` (``widen_limits``), so
+    each bucket is one pixel column of the axes; without them the buckets
+    span the transducer record.  Wells without transducer readings get empty
+    arrays.
+    """
+    if location not in transducer:
+        empty = np.zeros(0)
+        return {"transducer_Date": empty.astype("datetime64[ns]"), "transducer_DTW": empty}
+    i = transducer.position(location)
+    start, end = transducer.starts[i], transducer.ends[i]
+    dates = transducer.table["Date"].to_numpy()[start:end].astype("datetime64[ns]")
+    depth = transducer.table["DEPTH_TO_WATER"].to_numpy()[start:end]
+    x0 = x1 = None
+    if limits is not None:
+        x0, x1 = (np.datetime64(limit, "ns").astype(np.int64) for limit in limits)
+    x, y = downsample(dates.view(np.int64), depth, buckets, x0, x1)
+    return {"transducer_Date": x.astype("datetime64[ns]"), "transducer_DTW": y}